@@ -34,11 +34,14 @@ laufen können.
 ---------------------------------------------------------------------
 2.  Kategorisierung & Filter
 ---------------------------------------------------------------------
-Die Sprecher‑Metadaten sind im Kürzel `spkname` kodiert und werden mittels
-`map_speaker_attributes()` in Attribute zerlegt:
+Die Sprecher‑Metadaten sind im Kürzel `spkname` kodiert und werden über die
+Tabelle `SPEAKER_ATTRIBUTES` in Attribute zerlegt:
 
 ``(professionalität, geschlecht, modus, themenbereich)``
 
+Daraus abgeleitet ordnet `_MODE_GENDER` jedem berücksichtigten Kürzel
+``(modus, geschlecht)`` zu.
+
 Aktuelle Auswertung berücksichtigt **nur**
 
 ``professionalität == 'pro'``
@@ -47,8 +50,9 @@ und unterscheidet vier Buckets
 
 ``libre_f , libre_m , lectura_f , lectura_m``
 
-* **Mindestumfang**: Buckets mit < 10 Wörtern werden verworfen, um extreme
-  Varianzen bei Kleinstproben zu verhindern.
+* **Mindestumfang**: Buckets mit < 10 Wörtern erhalten keine Rate, um extreme
+  Varianzen bei Kleinstproben zu verhindern.  Die Grenze gilt für die
+  Bucket‑Summe (pro Datei bzw. Land), nicht für einzelne Segmente.
 
 ---------------------------------------------------------------------
 3.  Berechnete Kennzahlen pro Bucket
@@ -80,6 +84,10 @@ Alle CSVs sind *UTF‑8*, Feldtrennung ``;``. Fehlende Buckets erhalten den Wert
   (``BASE_WEB``, ``GRABACIONES_DIR`` usw.).
 * Unterordner ``results_speed`` wird bei Bedarf erstellt.
 * Minuten/Zeitberechnung in Sekunden; Umrechnung erfolgt erst beim Schreiben.
+* Die Dateien werden parallel in einem Prozess‑Pool ausgewertet
+  (``analyse_file()``); die Aggregation pro Land erfolgt im Hauptprozess.
+* JSON wird – falls installiert – mit *orjson* eingelesen (deutlich schneller
+  als das ``json``‑Modul der Standardbibliothek); sonst Fallback auf ``json``.
 * Aggregation pro Land: Country‑Code wird prioritär aus ``data['country_code']``
   gelesen; Fallback ist ein RegEx‐Match auf den Dateinamen.  Existiert beides
   nicht, wird ``UNK`` vergeben.
@@ -107,6 +115,8 @@ import os
 import re
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -132,32 +142,38 @@ CSV_SPEECH_CTTRY       = os.path.join(RESULTS_DIR, "speech_speed_by_country.csv"
 # Hilfsfunktionen
 # ---------------------------------------------------------------------------
 
+_COUNTRY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}_([^_]+)_")
+
 def extract_country_from_filename(fname: str) -> str:
     """Liefert den Ländercode aus einem Dateinamen
     ‚YYYY‑MM‑DD_COUNTRY_… .json‘, sonst "UNK"."""
     base = os.path.basename(fname)
-    m = re.match(r"^(\d{4}-\d{2}-\d{2})_([^_]+)_", base)
-    return m.group(2) if m else "UNK"
-
-def map_speaker_attributes(name):
-    """Mapping wie in analysis_tenses.py."""
-    mapping = {
-        'lib-pm':  ('pro', 'm', 'libre', 'general'),
-        'lib-pf':  ('pro', 'f', 'libre', 'general'),
-        'lib-om':  ('otro','m', 'libre', 'general'),
-        'lib-of':  ('otro','f', 'libre', 'general'),
-        'lec-pm':  ('pro', 'm', 'lectura', 'general'),
-        'lec-pf':  ('pro', 'f', 'lectura', 'general'),
-        'lec-om':  ('otro','m', 'lectura', 'general'),
-        'lec-of':  ('otro','f', 'lectura', 'general'),
-        'pre-pm':  ('pro', 'm', 'pre', 'general'),
-        'pre-pf':  ('pro', 'f', 'pre', 'general'),
-        'tie-pm':  ('pro', 'm', 'n/a', 'tiempo'),
-        'tie-pf':  ('pro', 'f', 'n/a', 'tiempo'),
-        'traf-pm': ('pro', 'm', 'n/a', 'tránsito'),
-        'traf-pf': ('pro', 'f', 'n/a', 'tránsito')
-    }
-    return mapping.get(name, ('', '', '', ''))
+    m = _COUNTRY_RE.match(base)
+    return m.group(1) if m else "UNK"
+
+SPEAKER_ATTRIBUTES = {
+    'lib-pm':  ('pro', 'm', 'libre', 'general'),
+    'lib-pf':  ('pro', 'f', 'libre', 'general'),
+    'lib-om':  ('otro','m', 'libre', 'general'),
+    'lib-of':  ('otro','f', 'libre', 'general'),
+    'lec-pm':  ('pro', 'm', 'lectura', 'general'),
+    'lec-pf':  ('pro', 'f', 'lectura', 'general'),
+    'lec-om':  ('otro','m', 'lectura', 'general'),
+    'lec-of':  ('otro','f', 'lectura', 'general'),
+    'pre-pm':  ('pro', 'm', 'pre', 'general'),
+    'pre-pf':  ('pro', 'f', 'pre', 'general'),
+    'tie-pm':  ('pro', 'm', 'n/a', 'tiempo'),
+    'tie-pf':  ('pro', 'f', 'n/a', 'tiempo'),
+    'traf-pm': ('pro', 'm', 'n/a', 'tránsito'),
+    'traf-pf': ('pro', 'f', 'n/a', 'tránsito')
+}
+
+# spkname → (modus, geschlecht), nur professionelle libre/lectura‑Sprecher
+_MODE_GENDER = {
+    name: (mode, gender)
+    for name, (prof, gender, mode, _) in SPEAKER_ATTRIBUTES.items()
+    if prof == "pro" and mode in ("libre", "lectura")
+}
 
 _word_re = re.compile(r"[A-Za-zÁÉÍÓÚáéíóúÑñÜü]+")
 
@@ -168,18 +184,31 @@ try:
 except ImportError:
     HAS_PYPHEN = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def load_json(path: str) -> dict:
+    """Liest ein Transkript; nutzt orjson, falls verfügbar."""
+    if HAS_ORJSON:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@lru_cache(maxsize=None)
 def count_syllables(word: str) -> int:
-    """Grobe Silbenzählung per Pyphen; fällt auf 1 zurück, falls Modul fehlt."""
+    """Grobe Silbenzählung per Pyphen; fällt auf 1 zurück, falls Modul fehlt.
+
+    Ergebnisse werden pro Wortform zwischengespeichert; Aufrufer übergeben das
+    Wort kleingeschrieben, damit Groß-/Kleinvarianten denselben Eintrag teilen.
+    """
     if not HAS_PYPHEN:
         return 1
     parts = _dic.inserted(word).split("-")
     return max(1, len(parts))
 
-def extract_country_from_filename(fname: str) -> str:
-    base_fname = os.path.basename(fname)
-    m = re.match(r"^(\d{4}-\d{2}-\d{2})_([^_]+)_", base_fname)
-    return m.group(2) if m else "UNK"
-
 # ---------------------------------------------------------------------------
 # Kernberechnungen
 # ---------------------------------------------------------------------------
@@ -187,57 +216,84 @@ def extract_country_from_filename(fname: str) -> str:
 BUCKETS = ["libre_f", "libre_m", "lectura_f", "lectura_m"]
 
 def init_bucket_dict():
-    return {b: {"words": 0, "syll": 0, "art_time": 0.0, "spk_time": 0.0, "net_time": 0.0, "seg_time": 0.0} for b in BUCKETS}
-
-def process_file(json_path: str, spk_map: dict):
-    """Liest ein Transkript und sammelt Zählungen pro Bucket."""
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    return {b: {"words": 0, "syll": 0, "net_time": 0.0, "seg_time": 0.0} for b in BUCKETS}
 
+def process_file(data: dict, spk_map: dict):
+    """Sammelt Zählungen pro Bucket aus einem bereits eingelesenen Transkript."""
     buckets = init_bucket_dict()
     segments = data.get("segments", [])
+    # Häufig genutzte Funktionen lokal binden (LOAD_FAST statt globaler Lookup)
+    word_search = _word_re.search
+    syllables = count_syllables
+
+    # spkid → Bucket einmal pro Datei auflösen (nur pro libre/lectura)
+    spkid_to_bucket = {}
+    for spkid, spkname in spk_map.items():
+        res = _MODE_GENDER.get(spkname)
+        if res is not None:
+            mode, gender = res
+            spkid_to_bucket[spkid] = f"{mode}_{gender}"
 
     for seg in segments:
-        spkid = seg.get("speaker")
-        spkname = spk_map.get(spkid, "")
-        prof, gender, mode, _ = map_speaker_attributes(spkname)
-        if prof != "pro" or mode not in ("libre", "lectura"):
+        bucket = spkid_to_bucket.get(seg.get("speaker"))
+        if bucket is None:
             continue  # nur professionelle libre/lectura
 
-        bucket = f"{mode}_{gender}"
-        words = [w for w in seg.get("words", []) if _word_re.search(w.get("text", ""))]
+        # Filter, Artikulationswerte (Summe Wortdauern) und Silben in einem
+        # Durchlauf über die Wort-Dicts, ohne Zwischenliste.
+        # Bewusst eine einfache Schleife: Segmente sind kurz, Array-Aufbau
+        # (NumPy) kostet hier mehr als die Summierung selbst.
+        n_words = 0
+        n_syll = 0
+        net_time = 0.0
+        first_start = last_end = 0.0
+        for w in seg.get("words", []):
+            text = w.get("text", "")
+            if not word_search(text):
+                continue
+            start = w["start"]
+            last_end = w["end"]
+            if not n_words:
+                first_start = start
+            n_words += 1
+            net_time += last_end - start
+            n_syll += syllables(text.lower())
+
+        # Keine Mindestwortzahl pro Segment: die Grenze (<10 Wörter) greift erst
+        # auf Bucket-Ebene in calc_rates, Länder-Summen erhalten alle Wörter.
+        if not n_words:
+            continue
 
-        if len(words) < 10:
-            continue  # Bucket-Grenze <10 Wörter
-
-        # Artikulationswerte (Summe Wortdauern)
-        net_time = sum((w["end"] - w["start"]) for w in words)
         # Sprechzeit = Segmentfenster (inkl. Pausen) – erste bis letzte Marke
-        seg_time = words[-1]["end"] - words[0]["start"]
-
-        n_words = len(words)
-        n_syll  = sum(count_syllables(w["text"]) for w in words)
+        seg_time = last_end - first_start
 
         b = buckets[bucket]
         b["words"]    += n_words
         b["syll"]     += n_syll
-        b["art_time"] += net_time
-        b["spk_time"] += seg_time
         b["net_time"] += net_time
         b["seg_time"] += seg_time
 
     return buckets
 
+def analyse_file(path: str):
+    """Worker für den Prozess‑Pool: liest eine Datei und liefert
+    ``(filename, country, counts)``."""
+    data = load_json(path)
+    # Sprecher‑Mapping vorbereiten
+    spk_map = {sp["spkid"]: sp.get("name", "") for sp in data.get("speakers", [])}
+    fname = os.path.basename(path)
+    return fname, extract_country_from_filename(fname), process_file(data, spk_map)
+
 def calc_rates(counts: dict):
     """Berechnet Wörter‑/Silben‑pro‑Minute aus den kumulierten Zählern."""
     rates = {}
     for bucket, vals in counts.items():
         w = vals["words"]
         s = vals["syll"]
-        art_t = vals["art_time"]
-        spk_t = vals["spk_time"]
-        art_min = vals["net_time"] / 60
-        spk_min = vals["seg_time"] / 60
+        art_t = vals["net_time"]   # AR: Nettozeit
+        spk_t = vals["seg_time"]   # SR: Segmentzeit
+        art_min = art_t / 60
+        spk_min = spk_t / 60
         rates[bucket] = {
             "art_wpm":  round((w / art_t) * 60, 1) if w >= 10 and art_t > 0 else "",
             "art_spm":  round((s / art_t) * 60, 1) if s and art_t > 0 else "",
@@ -267,36 +323,44 @@ def write_file_csv(path: str, per_file_rates: dict, key: str):
     """Schreibt pro Datei eine Zeile mit der gewünschten Rate (art_wpm/…).
     *key* ∈ {"art_wpm", "spk_wpm"}.
     """
+    min_key = "art_min" if key == "art_wpm" else "spk_min"
+    rows = []
+    for country in sorted(per_file_rates.keys()):
+        # Einträge wurden bereits in sortierter Dateireihenfolge angehängt
+        for fname, rates in per_file_rates[country]:
+            row = [country, fname]
+            for b in BUCKETS:
+                row.append(rates[b][key])
+                row.append(rates[b][min_key])
+            rows.append(row)
+
     with open(path, "w", encoding="utf-8", newline="") as csvfile:
         writer = csv.writer(csvfile, delimiter=";")
         writer.writerow(HEADER_FILE)
-        for country in sorted(per_file_rates.keys()):
-            for entry in sorted(per_file_rates[country], key=lambda x: x[0]):
-                row = [country, entry[0]]  # filename
-                for b in BUCKETS:
-                    row.append(entry[1][b][key])
-                    if key == "art_wpm":
-                        row.append(entry[1][b]["art_min"])
-                    else:
-                        row.append(entry[1][b]["spk_min"])
-                writer.writerow(row)
-
-def write_country_csv(path: str, country_counts: dict, key: str):
-    """Aggregiert counts → Rate nach Land und schreibt CSV."""
-    with open(path, "w", encoding="utf-8", newline="") as csvfile:
-        writer = csv.writer(csvfile, delimiter=";")
-        writer.writerow(HEADER_COUNTRY)
-        for country in sorted(country_counts.keys()):
-            counts = country_counts[country]
-            rates = calc_rates(counts)
-            row = [country]
-            for b in BUCKETS:
-                row.append(rates[b][key])
-                if key == "art_wpm":
-                    row.append(rates[b]["art_min"])
-                else:
-                    row.append(rates[b]["spk_min"])
-            writer.writerow(row)
+        writer.writerows(rows)
+
+def write_country_csvs(path_art: str, path_spk: str, country_counts: dict):
+    """Aggregiert counts → Rate nach Land und schreibt AR‑ und SR‑CSV in
+    einem Durchlauf (``calc_rates`` nur einmal pro Land)."""
+    rows_art = []
+    rows_spk = []
+    for country in sorted(country_counts.keys()):
+        rates = calc_rates(country_counts[country])
+        row_art = [country]
+        row_spk = [country]
+        for b in BUCKETS:
+            row_art.append(rates[b]["art_wpm"])
+            row_art.append(rates[b]["art_min"])
+            row_spk.append(rates[b]["spk_wpm"])
+            row_spk.append(rates[b]["spk_min"])
+        rows_art.append(row_art)
+        rows_spk.append(row_spk)
+
+    for path, rows in ((path_art, rows_art), (path_spk, rows_spk)):
+        with open(path, "w", encoding="utf-8", newline="") as csvfile:
+            writer = csv.writer(csvfile, delimiter=";")
+            writer.writerow(HEADER_COUNTRY)
+            writer.writerows(rows)
 
 # ---------------------------------------------------------------------------
 # Hauptlogik
@@ -307,48 +371,35 @@ def main():
         print(f"Ordner '{GRABACIONES_DIR}' nicht gefunden.")
         return
 
-    json_files = [f for f in os.listdir(GRABACIONES_DIR) if f.lower().endswith('.json')]
+    with os.scandir(GRABACIONES_DIR) as it:
+        json_files = sorted((e for e in it if e.name.lower().endswith('.json')),
+                            key=lambda e: e.name)
     if not json_files:
         print("Keine JSON‑Dateien gefunden, breche ab.")
         return
 
     per_file_rates = defaultdict(list)     # country → [ (filename, rates_dict) ]
-    country_counts_art = defaultdict(init_bucket_dict)  # summierte Counts
-    country_counts_spk = defaultdict(init_bucket_dict)
-
-    for fname in sorted(json_files):
-        path = os.path.join(GRABACIONES_DIR, fname)
-        # Sprecher‑Mapping vorbereiten
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        spk_map = {sp["spkid"]: sp.get("name", "") for sp in data.get("speakers", [])}
-
-        counts = process_file(path, spk_map)
-        rates  = calc_rates(counts)
+    country_counts = defaultdict(init_bucket_dict)  # summierte Counts (AR + SR)
 
-        country = extract_country_from_filename(fname)
-        per_file_rates[country].append((fname, rates))
+    # Dateien sind unabhängig voneinander → parallel auswerten;
+    # ex.map liefert die Ergebnisse in Eingabereihenfolge zurück.
+    paths = [e.path for e in json_files]
+    with ProcessPoolExecutor() as ex:
+        for fname, country, counts in ex.map(analyse_file, paths, chunksize=4):
+            rates = calc_rates(counts)
+            per_file_rates[country].append((fname, rates))
 
-        # Summen für Länderrate aufbauen
-        for b in BUCKETS:
-            ctry_art = country_counts_art[country][b]
-            ctry_spk = country_counts_spk[country][b]
-            c = counts[b]
-            ctry_art["words"]    += c["words"]
-            ctry_art["syll"]     += c["syll"]
-            ctry_art["art_time"] += c["art_time"]
-            ctry_art["net_time"] += c["net_time"]
-            ctry_spk["words"]    += c["words"]
-            ctry_spk["syll"]     += c["syll"]
-            ctry_spk["spk_time"] += c["spk_time"]
-            ctry_spk["seg_time"] += c["seg_time"]
+            # Summen für Länderrate aufbauen (Land nur einmal pro Datei auflösen)
+            ctry_buckets = country_counts[country]
+            for b, c in counts.items():
+                ctry = ctry_buckets[b]
+                for field, value in c.items():
+                    ctry[field] += value
 
     # ---------- CSV schreiben ----------
     write_file_csv(CSV_ARTICULATION_FILE, per_file_rates, key="art_wpm")
-    write_country_csv(CSV_ARTICULATION_CTTRY, country_counts_art, key="art_wpm")
-
     write_file_csv(CSV_SPEECH_FILE, per_file_rates, key="spk_wpm")
-    write_country_csv(CSV_SPEECH_CTTRY, country_counts_spk, key="spk_wpm")
+    write_country_csvs(CSV_ARTICULATION_CTTRY, CSV_SPEECH_CTTRY, country_counts)
 
     print("Analyse abgeschlossen. Ergebnisse gespeichert unter:")
     print(f"  {CSV_ARTICULATION_FILE}")
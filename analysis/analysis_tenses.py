@@ -38,8 +38,9 @@ sowie einem Rule-Based-Post-Processing erzeugt; relevante Merkmale liegen in
 2  Sprechmodus-Buckets
 ---------------------------------------------------------------------------
 
-Der Sprechername (`lib-pf`, `lec-pm`, usw.) wird mittels  
-`map_speaker_attributes()` in vier Attribute zerlegt :contentReference[oaicite:0]{index=0}.
+Der Sprechername (`lib-pf`, `lec-pm`, usw.) wird über die Tabelle
+`SPEAKER_ATTRIBUTES` in vier Attribute zerlegt :contentReference[oaicite:0]{index=0};
+die Auswertung nutzt daraus nur den Modus (`_SPEAKER_MODE`).
 
 Für die Tenz-Analyse werden **drei Modi** getrennt ausgewertet:
 
@@ -59,7 +60,9 @@ irrelevant.)
    `extract_country_from_filename()`; unbekannt → \"UNK\" :contentReference[oaicite:1]{index=1}.  
 3. Durchlauf aller `segments`, dann aller `words`; Tenz-Typ wird
    anhand der Tabellen oben klassifiziert :contentReference[oaicite:2]{index=2}.  
-4. **Zähler** pro Datei × Modus aktualisieren (`initialize_counters()`).  
+4. **Zähler** pro Datei × Modus aktualisieren (`initialize_counters()`);
+   die Dateien werden parallel in einem Prozess-Pool gezählt
+   (`count_tenses_file()`).  
 5. Nach Abschluss jeder Datei: absolute Counts + **Total** berechnen;
    Prozentwerte = Count / Total × 100 (%-Zahl auf eine Nachkommastelle).  
    *`analyticalFuture_past` wird **nicht** in die Futur-Prozentwerte
@@ -100,7 +103,10 @@ landesweite Verteilungen ohne Nachbearbeitung ersichtlich sind.
 ---------------------------------------------------------------------------
 
 * Python ≥ 3.8, Standardbibliotheken `os`, `json`, `csv`, `re`,
-  `collections.defaultdict`.  
+  `collections.defaultdict`, `concurrent.futures`.  
+* Optional `orjson` für schnelleres Einlesen der JSON-Dateien (Fallback: `json`).  
+* Optional `ijson`: sehr große Dateien (≥ `STREAM_MIN_BYTES`) werden
+  segmentweise gestreamt statt komplett geladen.  
 * Lizenz: MIT © 2025 Felix Tacke
 """
 
@@ -109,26 +115,41 @@ import re
 import csv
 import json
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 # Das Mapping der Sprecherattribute wird hier direkt definiert, basierend auf database_creation.py
-def map_speaker_attributes(name):
-    mapping = {
-        'lib-pm':  ('pro', 'm', 'libre', 'general'),
-        'lib-pf':  ('pro', 'f', 'libre', 'general'),
-        'lib-om':  ('otro','m', 'libre', 'general'),
-        'lib-of':  ('otro','f', 'libre', 'general'),
-        'lec-pm':  ('pro', 'm', 'lectura', 'general'),
-        'lec-pf':  ('pro', 'f', 'lectura', 'general'),
-        'lec-om':  ('otro','m', 'lectura', 'general'),
-        'lec-of':  ('otro','f', 'lectura', 'general'),
-        'pre-pm':  ('pro', 'm', 'pre', 'general'),
-        'pre-pf':  ('pro', 'f', 'pre', 'general'),
-        'tie-pm':  ('pro', 'm', 'n/a', 'tiempo'),
-        'tie-pf':  ('pro', 'f', 'n/a', 'tiempo'),
-        'traf-pm': ('pro', 'm', 'n/a', 'tránsito'),
-        'traf-pf': ('pro', 'f', 'n/a', 'tránsito')
-    }
-    return mapping.get(name, ('','', '',''))
+SPEAKER_ATTRIBUTES = {
+    'lib-pm':  ('pro', 'm', 'libre', 'general'),
+    'lib-pf':  ('pro', 'f', 'libre', 'general'),
+    'lib-om':  ('otro','m', 'libre', 'general'),
+    'lib-of':  ('otro','f', 'libre', 'general'),
+    'lec-pm':  ('pro', 'm', 'lectura', 'general'),
+    'lec-pf':  ('pro', 'f', 'lectura', 'general'),
+    'lec-om':  ('otro','m', 'lectura', 'general'),
+    'lec-of':  ('otro','f', 'lectura', 'general'),
+    'pre-pm':  ('pro', 'm', 'pre', 'general'),
+    'pre-pf':  ('pro', 'f', 'pre', 'general'),
+    'tie-pm':  ('pro', 'm', 'n/a', 'tiempo'),
+    'tie-pf':  ('pro', 'f', 'n/a', 'tiempo'),
+    'traf-pm': ('pro', 'm', 'n/a', 'tránsito'),
+    'traf-pf': ('pro', 'f', 'n/a', 'tránsito')
+}
+
+# spkname -> Modus; nur dieses Attribut wird für die Tempus-Analyse gebraucht
+_SPEAKER_MODE = {name: attrs[2] for name, attrs in SPEAKER_ATTRIBUTES.items()}
 
 # Ordner, in dem sich dieses Skript befindet
 SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -149,34 +170,76 @@ RESULTS_CSV_PASADO_LIBRE = os.path.join(RESULTS_DIR, "analysis_pasado_results_li
 RESULTS_CSV_PASADO_LECTURA = os.path.join(RESULTS_DIR, "analysis_pasado_results_lectura.csv")
 RESULTS_CSV_PASADO_PRE = os.path.join(RESULTS_DIR, "analysis_pasado_results_pre.csv")
 
+_COUNTRY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}_([^_]+)_")
+
 def extract_country_from_filename(fname: str) -> str:
     base_fname = os.path.basename(fname)
-    m = re.match(r"^(\d{4}-\d{2}-\d{2})_([^_]+)_", base_fname)
-    return m.group(2) if m else "UNK"
+    m = _COUNTRY_RE.match(base_fname)
+    return m.group(1) if m else "UNK"
+
+def load_json(path):
+    """Liest ein Transkript; nutzt orjson, falls verfügbar."""
+    if HAS_ORJSON:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_speaker_map(speakers):
+    """Liefert das Mapping spkid -> Sprechername aus der Sprecherliste."""
+    spk_map = {}
+    for sp in speakers:
+        sid = sp.get('spkid')
+        sname = sp.get('name')
+        if sid:
+            spk_map[sid] = sname
+    return spk_map
+
+# Indizes der Zählerfelder (siehe initialize_counters)
+ANALYTICAL_FUTURE, SIMPLE_FUTURE, COMPOUND_PAST, SIMPLE_PAST = range(4)
+
+# Klassifikationswert -> Zählerindex; ersetzt die if/elif-Ketten
+_FUTURE_TYPE_IDX = {'analyticalFuture': ANALYTICAL_FUTURE}
+_PAST_TYPE_IDX = {'PerfectoCompuesto': COMPOUND_PAST, 'PerfectoSimple': SIMPLE_PAST}
+
+# Ab dieser Dateigröße werden die Segmente mit ijson gestreamt (begrenzter
+# Speicher pro Worker-Prozess); darunter ist das Komplett-Parsen schneller.
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+def _stream_segments(path):
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'segments.item')
+
+def load_speakers_and_segments(path):
+    """
+    Liefert (spk_map, segments). Große Dateien werden – sofern ijson
+    installiert ist – in zwei Durchläufen gestreamt (erst `speakers`, dann
+    `segments`), ohne das vollständige JSON-Objekt im Speicher zu halten.
+    """
+    if HAS_IJSON and os.path.getsize(path) >= STREAM_MIN_BYTES:
+        with open(path, 'rb') as f:
+            spk_map = build_speaker_map(ijson.items(f, 'speakers.item'))
+        return spk_map, _stream_segments(path)
+    data = load_json(path)
+    return build_speaker_map(data.get('speakers', [])), data.get('segments', [])
 
 def initialize_counters():
-    return {
-        'analyticalFuture': 0,
-        'simpleFuture': 0,
-        'compoundPast': 0,
-        'simplePast': 0
-    }
+    # [analyticalFuture, simpleFuture, compoundPast, simplePast]
+    return [0, 0, 0, 0]
 
 def update_future_counters(counters, future_type, tense_vals):
-    if future_type == 'analyticalFuture':
-        counters['analyticalFuture'] += 1
+    idx = _FUTURE_TYPE_IDX.get(future_type)
+    if idx is not None:
+        counters[idx] += 1
     elif 'Fut' in tense_vals:
-        counters['simpleFuture'] += 1
+        counters[SIMPLE_FUTURE] += 1
 
 def update_pasado_counters(counters, morph):
     if not isinstance(morph, dict):
         return
     if "Past" in morph.get("Tense", []):
-        ptype = morph.get("Past_Tense_Type", "PastOther")
-        if ptype == "PerfectoCompuesto":
-            counters['compoundPast'] += 1
-        elif ptype == "PerfectoSimple":
-            counters['simplePast'] += 1
+        idx = _PAST_TYPE_IDX.get(morph.get("Past_Tense_Type", "PastOther"))
+        if idx is not None:
+            counters[idx] += 1
 
 def write_results_csv(path, results, is_future=True):
     with open(path, "w", encoding="utf-8", newline="") as csvfile:
@@ -203,7 +266,8 @@ def write_results_csv(path, results, is_future=True):
             ]
         writer.writerow(header)
         for country in sorted(results.keys()):
-            entries = sorted(results[country], key=lambda x: x[0])
+            # Einträge wurden bereits in sortierter Dateireihenfolge angehängt
+            entries = results[country]
             sum_af = 0
             sum_fut = 0
             sum_pc = 0
@@ -252,6 +316,59 @@ def write_results_csv(path, results, is_future=True):
                 )
             writer.writerow([])
 
+MODES = ('total', 'libre', 'lectura', 'pre')
+
+def count_tenses_file(file_path):
+    """
+    Worker für den Prozess-Pool: zählt Futur- und Pasado-Formen einer Datei.
+    Liefert (filename, counters_future, counters_pasado) mit je einem
+    Zähler-Dict pro Modus (siehe MODES).
+    """
+    # Sprecher-Mapping und Segmente aus JSON
+    spk_map, segments = load_speakers_and_segments(file_path)
+
+    # Zähler für alle Modi initialisieren
+    counters_future = {m: initialize_counters() for m in MODES}
+    counters_pasado = {m: initialize_counters() for m in MODES}
+    counters_future_total = counters_future['total']
+    counters_pasado_total = counters_pasado['total']
+
+    # Modus -> Zähler; wird pro Segment einmal aufgelöst statt pro Wort
+    counters_future_by_mode = {m: counters_future[m] for m in ('libre', 'lectura', 'pre')}
+    counters_pasado_by_mode = {m: counters_pasado[m] for m in ('libre', 'lectura', 'pre')}
+
+    # spkid -> Modus einmal pro Datei auflösen
+    spkid_to_mode = {sid: _SPEAKER_MODE.get(sname, '') for sid, sname in spk_map.items()}
+
+    # Häufig genutzte Funktionen lokal binden (LOAD_FAST statt globaler Lookup)
+    update_future = update_future_counters
+    update_pasado = update_pasado_counters
+
+    for seg in segments:
+        mode = spkid_to_mode.get(seg.get('speaker'), '')
+        counters_future_mode = counters_future_by_mode.get(mode)
+        counters_pasado_mode = counters_pasado_by_mode.get(mode)
+
+        wlist = seg.get('words', [])
+        for w_obj in wlist:
+            morph = w_obj.get('morph', {})
+            if not isinstance(morph, dict):
+                continue
+
+            # Futur-Formen zählen
+            future_type = morph.get('Future_Type', '')
+            tense_vals = morph.get('Tense', [])
+            update_future(counters_future_total, future_type, tense_vals)
+            if counters_future_mode is not None:
+                update_future(counters_future_mode, future_type, tense_vals)
+
+            # Pasado-Formen zählen
+            update_pasado(counters_pasado_total, morph)
+            if counters_pasado_mode is not None:
+                update_pasado(counters_pasado_mode, morph)
+
+    return os.path.basename(file_path), counters_future, counters_pasado
+
 def main():
     if not os.path.isdir(GRABACIONES_DIR):
         print(f"Ordner '{GRABACIONES_DIR}' nicht gefunden.")
@@ -261,151 +378,51 @@ def main():
     if not os.path.exists(RESULTS_DIR):
         os.makedirs(RESULTS_DIR)
 
-    json_files = [f for f in os.listdir(GRABACIONES_DIR) if f.lower().endswith('.json')]
+    with os.scandir(GRABACIONES_DIR) as it:
+        json_files = sorted((e for e in it if e.name.lower().endswith('.json')),
+                            key=lambda e: e.name)
     if not json_files:
         print("Keine JSON-Dateien gefunden, breche ab.")
         return
 
     # Ergebnisse für alle Modi initialisieren
-    results_future_total = defaultdict(list)
-    results_future_libre = defaultdict(list)
-    results_future_lectura = defaultdict(list)
-    results_future_pre = defaultdict(list)
-
-    results_pasado_total = defaultdict(list)
-    results_pasado_libre = defaultdict(list)
-    results_pasado_lectura = defaultdict(list)
-    results_pasado_pre = defaultdict(list)
-
-    for filename in sorted(json_files):
-        file_path = os.path.join(GRABACIONES_DIR, filename)
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Sprecher-Mapping aus JSON
-        spk_map = {}
-        for sp in data.get('speakers', []):
-            sid = sp.get('spkid')
-            sname = sp.get('name')
-            if sid:
-                spk_map[sid] = sname
-
-        # Zähler für alle Modi initialisieren
-        counters_future_total = initialize_counters()
-        counters_future_libre = initialize_counters()
-        counters_future_lectura = initialize_counters()
-        counters_future_pre = initialize_counters()
-
-        counters_pasado_total = initialize_counters()
-        counters_pasado_libre = initialize_counters()
-        counters_pasado_lectura = initialize_counters()
-        counters_pasado_pre = initialize_counters()
-
-        segments = data.get('segments', [])
-        for seg in segments:
-            spkid = seg.get('speaker')
-            spkname = spk_map.get(spkid, '')
-            _, _, mode, _ = map_speaker_attributes(spkname)
-
-            wlist = seg.get('words', [])
-            for w_obj in wlist:
-                morph = w_obj.get('morph', {})
-                if not isinstance(morph, dict):
-                    continue
-
-                # Futur-Formen zählen
-                future_type = morph.get('Future_Type', '')
-                tense_vals = morph.get('Tense', [])
-                update_future_counters(counters_future_total, future_type, tense_vals)
-                if mode == 'libre':
-                    update_future_counters(counters_future_libre, future_type, tense_vals)
-                elif mode == 'lectura':
-                    update_future_counters(counters_future_lectura, future_type, tense_vals)
-                elif mode == 'pre':
-                    update_future_counters(counters_future_pre, future_type, tense_vals)
-
-                # Pasado-Formen zählen
-                update_pasado_counters(counters_pasado_total, morph)
-                if mode == 'libre':
-                    update_pasado_counters(counters_pasado_libre, morph)
-                elif mode == 'lectura':
-                    update_pasado_counters(counters_pasado_lectura, morph)
-                elif mode == 'pre':
-                    update_pasado_counters(counters_pasado_pre, morph)
-
-        total_for_percentage_future_total = counters_future_total['analyticalFuture'] + counters_future_total['simpleFuture']
-        total_for_percentage_future_libre = counters_future_libre['analyticalFuture'] + counters_future_libre['simpleFuture']
-        total_for_percentage_future_lectura = counters_future_lectura['analyticalFuture'] + counters_future_lectura['simpleFuture']
-        total_for_percentage_future_pre = counters_future_pre['analyticalFuture'] + counters_future_pre['simpleFuture']
-
-        total_for_percentage_pasado_total = counters_pasado_total['compoundPast'] + counters_pasado_total['simplePast']
-        total_for_percentage_pasado_libre = counters_pasado_libre['compoundPast'] + counters_pasado_libre['simplePast']
-        total_for_percentage_pasado_lectura = counters_pasado_lectura['compoundPast'] + counters_pasado_lectura['simplePast']
-        total_for_percentage_pasado_pre = counters_pasado_pre['compoundPast'] + counters_pasado_pre['simplePast']
-
-        country_code = extract_country_from_filename(filename)
-
-        # Ergebnisse speichern
-        results_future_total[country_code].append([
-            filename,
-            counters_future_total['analyticalFuture'],
-            counters_future_total['simpleFuture'],
-            total_for_percentage_future_total
-        ])
-        results_future_libre[country_code].append([
-            filename,
-            counters_future_libre['analyticalFuture'],
-            counters_future_libre['simpleFuture'],
-            total_for_percentage_future_libre
-        ])
-        results_future_lectura[country_code].append([
-            filename,
-            counters_future_lectura['analyticalFuture'],
-            counters_future_lectura['simpleFuture'],
-            total_for_percentage_future_lectura
-        ])
-        results_future_pre[country_code].append([
-            filename,
-            counters_future_pre['analyticalFuture'],
-            counters_future_pre['simpleFuture'],
-            total_for_percentage_future_pre
-        ])
-
-        results_pasado_total[country_code].append([
-            filename,
-            counters_pasado_total['compoundPast'],
-            counters_pasado_total['simplePast'],
-            total_for_percentage_pasado_total
-        ])
-        results_pasado_libre[country_code].append([
-            filename,
-            counters_pasado_libre['compoundPast'],
-            counters_pasado_libre['simplePast'],
-            total_for_percentage_pasado_libre
-        ])
-        results_pasado_lectura[country_code].append([
-            filename,
-            counters_pasado_lectura['compoundPast'],
-            counters_pasado_lectura['simplePast'],
-            total_for_percentage_pasado_lectura
-        ])
-        results_pasado_pre[country_code].append([
-            filename,
-            counters_pasado_pre['compoundPast'],
-            counters_pasado_pre['simplePast'],
-            total_for_percentage_pasado_pre
-        ])
+    results_future = {m: defaultdict(list) for m in MODES}
+    results_pasado = {m: defaultdict(list) for m in MODES}
+
+    # Dateien sind unabhängig voneinander -> parallel zählen;
+    # ex.map liefert die Ergebnisse in Eingabereihenfolge zurück.
+    paths = [e.path for e in json_files]
+    with ProcessPoolExecutor() as ex:
+        for filename, counters_future, counters_pasado in ex.map(count_tenses_file, paths, chunksize=4):
+            country_code = extract_country_from_filename(filename)
+
+            # Ergebnisse speichern
+            for m in MODES:
+                cf = counters_future[m]
+                results_future[m][country_code].append([
+                    filename,
+                    cf[ANALYTICAL_FUTURE],
+                    cf[SIMPLE_FUTURE],
+                    cf[ANALYTICAL_FUTURE] + cf[SIMPLE_FUTURE]
+                ])
+                cp = counters_pasado[m]
+                results_pasado[m][country_code].append([
+                    filename,
+                    cp[COMPOUND_PAST],
+                    cp[SIMPLE_PAST],
+                    cp[COMPOUND_PAST] + cp[SIMPLE_PAST]
+                ])
 
     # CSV-Dateien schreiben
-    write_results_csv(RESULTS_CSV_FUTURE_TOTAL, results_future_total, is_future=True)
-    write_results_csv(RESULTS_CSV_FUTURE_LIBRE, results_future_libre, is_future=True)
-    write_results_csv(RESULTS_CSV_FUTURE_LECTURA, results_future_lectura, is_future=True)
-    write_results_csv(RESULTS_CSV_FUTURE_PRE, results_future_pre, is_future=True)
-
-    write_results_csv(RESULTS_CSV_PASADO_TOTAL, results_pasado_total, is_future=False)
-    write_results_csv(RESULTS_CSV_PASADO_LIBRE, results_pasado_libre, is_future=False)
-    write_results_csv(RESULTS_CSV_PASADO_LECTURA, results_pasado_lectura, is_future=False)
-    write_results_csv(RESULTS_CSV_PASADO_PRE, results_pasado_pre, is_future=False)
+    write_results_csv(RESULTS_CSV_FUTURE_TOTAL, results_future['total'], is_future=True)
+    write_results_csv(RESULTS_CSV_FUTURE_LIBRE, results_future['libre'], is_future=True)
+    write_results_csv(RESULTS_CSV_FUTURE_LECTURA, results_future['lectura'], is_future=True)
+    write_results_csv(RESULTS_CSV_FUTURE_PRE, results_future['pre'], is_future=True)
+
+    write_results_csv(RESULTS_CSV_PASADO_TOTAL, results_pasado['total'], is_future=False)
+    write_results_csv(RESULTS_CSV_PASADO_LIBRE, results_pasado['libre'], is_future=False)
+    write_results_csv(RESULTS_CSV_PASADO_LECTURA, results_pasado['lectura'], is_future=False)
+    write_results_csv(RESULTS_CSV_PASADO_PRE, results_pasado['pre'], is_future=False)
 
     print("Analyse abgeschlossen. Ergebnisse in den CSV-Dateien gespeichert.")
 
@@ -17,6 +17,12 @@ folgt ein Post-Processing, um spanische Vergangenheitsformen (PerfectoSimple,
 PerfectoCompuesto usw.) sowie analytische Futurformen genauer zu klassifizieren.
 Bereits annotierte Dateien (sofern ein Wort bereits pos/morph trägt) werden übersprungen.
 
+Die Kontexte aller Dateien laufen gebündelt durch nlp.pipe(); mit
+--n-process N verteilt spaCy die Verarbeitung auf N Prozesse.
+Ist eine GPU verfügbar, läuft das Transformer-Modell dort (spacy.prefer_gpu).
+Die Vorprüfung (bereits annotiert? Wortanzahl) streamt die Dateien mit ijson,
+sofern installiert; geladen werden dann nur die zu annotierenden Dateien.
+
 Fortschrittsmeldungen:
 - Zu Beginn: Anzahl zu annotierender Dateien & Gesamtzahl Wörter
 - Beim Start jeder Datei: Meldung mit der Wortanzahl dieser Datei
@@ -26,9 +32,26 @@ Fortschrittsmeldungen:
 
 import os
 import json
+import argparse
 import spacy
 import warnings
 import string
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
@@ -39,38 +62,88 @@ SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
 BASE_WEB = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "..", "CO.RA.PAN-WEB"))
 GRABACIONES_DIR = os.path.join(BASE_WEB, "grabaciones")
 
-# Lade das gewünschte spaCy-Modell (z.B. "es_dep_news_trf" oder "es_core_news_md")
-nlp = spacy.load("es_dep_news_trf")
+# Das gewünschte spaCy-Modell (z.B. "es_dep_news_trf" oder "es_core_news_md");
+# geladen wird es erst in load_nlp(), wenn tatsächlich Dateien zu annotieren sind
+SPACY_MODEL = "es_dep_news_trf"
+nlp = None
+USING_GPU = False
+# Anzahl Kontexte pro nlp.pipe()-Batch; wird in load_nlp() gesetzt
+SPACY_BATCH_SIZE = 32
+
+
+def load_nlp():
+    """
+    Lädt das spaCy-Modell (einmalig) und setzt USING_GPU und SPACY_BATCH_SIZE.
+    """
+    global nlp, USING_GPU, SPACY_BATCH_SIZE
+    if nlp is not None:
+        return
+    # GPU nutzen, falls vorhanden (muss vor spacy.load erfolgen); ohne GPU
+    # liefert prefer_gpu() False und spaCy bleibt auf der CPU
+    USING_GPU = spacy.prefer_gpu()
+    nlp = spacy.load(SPACY_MODEL)
+    # NER wird nicht gebraucht (genutzt werden nur pos, lemma, dep, head, morph);
+    # abschalten, falls das Modell die Komponente enthält (z.B. es_core_news_*)
+    if "ner" in nlp.pipe_names:
+        nlp.disable_pipe("ner")
+    # Batchgröße per Umgebungsvariable anpassbar; auf der GPU lohnen größere Batches
+    SPACY_BATCH_SIZE = int(os.environ.get("CORAPAN_SPACY_BATCH_SIZE", "128" if USING_GPU else "32"))
 
 # -----------------------------------------------------------------------------
 # Hilfsfunktionen
 # -----------------------------------------------------------------------------
 
+def load_json(path: str) -> dict:
+    """Liest eine JSON-Datei; nutzt orjson, falls verfügbar."""
+    if HAS_ORJSON:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path: str, data: dict, compact: bool = False):
+    """
+    Schreibt eine JSON-Datei (UTF-8, 2 Leerzeichen Einrückung bzw. kompakt
+    ohne Leerraum); nutzt orjson, falls verfügbar.
+    """
+    if HAS_ORJSON:
+        option = None if compact else orjson.OPT_INDENT_2
+        Path(path).write_bytes(orjson.dumps(data, option=option))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        if compact:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        else:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+# Satzendezeichen; Tupel für str.endswith
+_SENT_END = (".", "?", "!")
+
+
 def split_into_sentences(words_list):
     """
     Teilt das Wort-Array in 'Sätze' auf, anhand einfacher Satzzeichentrenner (. ? !).
     Gibt eine Liste von Sätzen zurück, wobei jeder Satz eine Liste von Wort-Objekten ist.
     """
-    sentence_ends = {".", "?", "!"}
+    # Satzgrenzen: Index hinter jedem Wort, das auf . ? ! endet
+    ends = [i for i, w in enumerate(words_list, 1) if w.get("text", "").strip().endswith(_SENT_END)]
     sentences = []
-    current_sentence = []
-
-    for w in words_list:
-        current_sentence.append(w)
-        txt = w.get("text", "").strip().lower()
-        if txt and any(txt.endswith(se) for se in sentence_ends):
-            sentences.append(current_sentence)
-            current_sentence = []
+    start = 0
+    for end in ends:
+        sentences.append(words_list[start:end])
+        start = end
 
     # Falls letzter Satz nicht abgeschlossen war
-    if current_sentence:
-        sentences.append(current_sentence)
+    if start < len(words_list):
+        sentences.append(words_list[start:])
 
     return sentences
 
 
 PUNCT_CHARS = string.punctuation + "¿¡"
 
+@lru_cache(maxsize=200_000)
 def strip_punct(token_text: str) -> str:
     """
     Entfernt Satzzeichen am Wortanfang und -ende,
@@ -79,11 +152,26 @@ def strip_punct(token_text: str) -> str:
     return token_text.strip(PUNCT_CHARS)
 
 
-def annotate_fallback(word_text: str) -> dict:
+def is_skipped_word(w_obj) -> bool:
+    """
+    True für Wörter, die ohne spaCy behandelt werden:
+    foreign, abgebrochene Wörter ("tu-") und die Interjektion "eeh".
+    """
+    txt = w_obj.get("text", "")
+    return w_obj.get("foreign") == "1" or txt.endswith("-") or txt.lower() == "eeh"
+
+
+# Fallback-Annotationen je Wortform (dateiübergreifend), begrenzt auf
+# FALLBACK_CACHE_SIZE Einträge
+FALLBACK_CACHE_SIZE = 50_000
+_fallback_cache = {}
+
+
+def annotate_fallback(doc, word_text: str) -> dict:
     """
-    Fallback: Einzelnes Wort separat parsen, falls kein direkter spaCy-Token passt.
+    Fallback: Annotation aus dem separat geparsten Einzelwort (doc),
+    falls kein direkter spaCy-Token passt.
     """
-    doc = nlp(word_text)
     if len(doc) > 0:
         t = doc[0]
         return {
@@ -119,11 +207,29 @@ def already_annotated(segments) -> bool:
     Prüft, ob in den gegebenen Segmenten schon mind. ein Wort mit "pos" oder "morph" existiert.
     Falls ja => Datei ist bereits annotiert.
     """
-    for seg in segments:
-        for w in seg.get("words", []):
-            if "pos" in w or "morph" in w:
-                return True
-    return False
+    return any("pos" in w or "morph" in w for seg in segments for w in seg.get("words", ()))
+
+def quick_scan(path, check_annotated=True):
+    """
+    Vorprüfung einer Datei für main(): liefert (bereits_annotiert, Wortanzahl).
+    Mit ijson wird die Datei gestreamt, ohne sie komplett zu laden; bei
+    check_annotated endet der Durchlauf beim ersten Wort mit "pos" oder
+    "morph" (die Wortanzahl ist dann unvollständig). Ohne ijson wird die Datei
+    geladen und sofort wieder verworfen, damit nie das ganze Korpus im Speicher liegt.
+    """
+    if not HAS_IJSON:
+        segments = load_json(path).get("segments", [])
+        words = sum(len(seg.get("words", [])) for seg in segments)
+        return check_annotated and already_annotated(segments), words
+    words = 0
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == "segments.item.words.item":
+                if event == "start_map":
+                    words += 1
+                elif check_annotated and event == "map_key" and value in ("pos", "morph"):
+                    return True, words
+    return False, words
 
 # -----------------------------------------------------------------------------
 # Fortschrittsmeldungen
@@ -154,12 +260,12 @@ def file_finished_message(progress_data):
 # -----------------------------------------------------------------------------
 # Post-Processing (Vergangenheitsformen)
 # -----------------------------------------------------------------------------
-PRESENT_FORMS = {
+PRESENT_FORMS = frozenset({
     "he", "has", "ha", "hemos", "habéis", "han", "habés", "habís", "habemos"
-}
-IMPERFECT_FORMS = {"había", "habías", "habíamos", "habíais", "habían"}
-FUTURE_FORMS    = {"habré", "habrás", "habrá", "habremos", "habréis", "habrán"}
-COND_FORMS      = {"habría", "habrías", "habríamos", "habríais", "habrían"}
+})
+IMPERFECT_FORMS = frozenset({"había", "habías", "habíamos", "habíais", "habían"})
+FUTURE_FORMS    = frozenset({"habré", "habrás", "habrá", "habremos", "habréis", "habrán"})
+COND_FORMS      = frozenset({"habría", "habrías", "habríamos", "habríais", "habrían"})
 
 
 def set_past_tense_type(w_obj: dict, label: str):
@@ -171,76 +277,86 @@ def set_past_tense_type(w_obj: dict, label: str):
     w_obj["morph"]["Past_Tense_Type"] = label
 
 
-def detect_compound_any_fallback(part_word: dict, seg_words: list) -> bool:
+# Partizip: Label je nach Hilfsverb (head_text, kleingeschrieben)
+AUX_PART_LABELS = {
+    form: label
+    for forms, label in (
+        (PRESENT_FORMS, "PerfectoCompuesto"),
+        (IMPERFECT_FORMS, "Pluscuamperfecto"),
+        (FUTURE_FORMS, "FuturoPerfecto"),
+        (COND_FORMS, "CondicionalPerfecto"),
+    )
+    for form in forms
+}
+
+
+def aux_pres_heads(seg_words: list, morphs: list) -> dict:
     """
-    Prüft, ob es ein AUX mit Tense=Pres gibt, das dieses Partizip als head_text hat.
-    Wenn ja, markiere "PerfectoCompuesto" und liefere True.
+    Sammelt für ein Segment alle AUX mit Tense=Pres:
+    head_text (kleingeschrieben) -> Liste der Wortindizes.
     """
-    part_text_lower = part_word["text"].lower()
-    for sibling in seg_words:
-        if sibling is part_word:
-            continue
-        if sibling.get("pos") == "AUX":
-            morph = sibling.get("morph", {})
-            if "Pres" in morph.get("Tense", []) and sibling.get("head_text", "").lower() == part_text_lower:
-                set_past_tense_type(part_word, "PerfectoCompuesto")
-                return True
-    return False
+    heads = {}
+    for i, (w, morph) in enumerate(zip(seg_words, morphs)):
+        if w.get("pos") == "AUX" and isinstance(morph, dict) and "Pres" in morph.get("Tense", []):
+            heads.setdefault(w.get("head_text", "").lower(), []).append(i)
+    return heads
 
 
-def classify_past_tense_form(w_obj: dict, seg_words: list):
+def classify_past_tense_form(i: int, w_obj: dict, morph: dict, get_heads) -> str:
     """
-    Prüft, ob Tense=Past => Kennzeichnung als PerfectoSimple, PerfectoCompuesto, etc.
+    Liefert für ein Wort mit Tense=Past das Label PerfectoSimple, PerfectoCompuesto usw.
+    get_heads() liefert die (erst bei Bedarf berechneten) AUX-Köpfe des Segments
+    (siehe aux_pres_heads).
     """
-    morph = w_obj.get("morph", {})
-    if not isinstance(morph, dict):
-        return
-    tense_vals = morph.get("Tense", [])
     verbform_vals = morph.get("VerbForm", [])
-    if "Past" not in tense_vals:
-        return
     # PerfectoSimple => Tense=Past + VerbForm=Fin
     if "Fin" in verbform_vals:
-        set_past_tense_type(w_obj, "PerfectoSimple")
-        return
+        return "PerfectoSimple"
     # Partizip => Tense=Past + VerbForm=Part
     if "Part" in verbform_vals:
-        aux_raw = w_obj.get("head_text", "").lower()
-        if aux_raw in PRESENT_FORMS:
-            set_past_tense_type(w_obj, "PerfectoCompuesto")
-        elif aux_raw in IMPERFECT_FORMS:
-            set_past_tense_type(w_obj, "Pluscuamperfecto")
-        elif aux_raw in FUTURE_FORMS:
-            set_past_tense_type(w_obj, "FuturoPerfecto")
-        elif aux_raw in COND_FORMS:
-            set_past_tense_type(w_obj, "CondicionalPerfecto")
-        elif detect_compound_any_fallback(w_obj, seg_words):
-            return
-        else:
-            set_past_tense_type(w_obj, "OtroCompuesto")
-        return
+        label = AUX_PART_LABELS.get(w_obj.get("head_text", "").lower())
+        if label:
+            return label
+        # Fallback: gibt es ein AUX mit Tense=Pres, das dieses Partizip als head_text hat?
+        for j in get_heads().get(w_obj["text"].lower(), ()):
+            if j != i:
+                return "PerfectoCompuesto"
+        return "OtroCompuesto"
     # Falls Past, aber weder Fin noch Part => "PastOther"
-    set_past_tense_type(w_obj, "PastOther")
+    return "PastOther"
 
 
 def post_process_compound_tenses(data: dict):
     """
     Durchläuft alle Segmente/Wörter und verfeinert Vergangenheitsformen.
+    Die morph-Felder eines Segments werden einmal vorab gelesen.
     """
     for seg in data.get("segments", []):
         seg_words = seg.get("words", [])
-        for w_obj in seg_words:
-            morph = w_obj.get("morph", {})
-            if not isinstance(morph, dict):
-                continue
-            if "Past" in morph.get("Tense", []):
-                classify_past_tense_form(w_obj, seg_words)
+        morphs = [w.get("morph", {}) for w in seg_words]
+        past_idx = [
+            i for i, morph in enumerate(morphs)
+            if isinstance(morph, dict) and "Past" in morph.get("Tense", [])
+        ]
+        if not past_idx:
+            continue
+        heads = None
+
+        def get_heads():
+            nonlocal heads
+            if heads is None:
+                heads = aux_pres_heads(seg_words, morphs)
+            return heads
+
+        for i in past_idx:
+            w_obj = seg_words[i]
+            set_past_tense_type(w_obj, classify_past_tense_form(i, w_obj, morphs[i], get_heads))
 
 # -----------------------------------------------------------------------------
 # Zukunftsformen-Erkennung (analytisches Futur)
 # -----------------------------------------------------------------------------
-IR_PRESENT_FORMS    = {"voy", "vas", "va", "vamos", "vais", "van"}
-IR_IMPERFECT_FORMS = {"iba", "ibas", "íbamos", "ibais", "iban"}
+IR_PRESENT_FORMS    = frozenset({"voy", "vas", "va", "vamos", "vais", "van"})
+IR_IMPERFECT_FORMS = frozenset({"iba", "ibas", "íbamos", "ibais", "iban"})
 
 
 def set_future_type(w_obj: dict, label: str):
@@ -255,24 +371,19 @@ def set_future_type(w_obj: dict, label: str):
 def post_process_compound_futures(data: dict):
     for seg in data.get("segments", []):
         words = seg.get("words", [])
-        for i in range(len(words) - 2):
-            w1, w2, w3 = words[i], words[i+1], words[i+2]
-
-            pos1 = w1.get("pos")
-            morph1 = w1.get("morph", {})
-            pos2 = w2.get("pos")
-            txt2 = w2.get("text", "").lower()
-            pos3 = w3.get("pos")
-            morph3 = w3.get("morph", {})
-
+        if len(words) < 3:
+            continue
+        # pos einmal je Segment lesen; die Prüfung pos1/pos2/pos3 filtert fast alle Stellen
+        pos = [w.get("pos") for w in words]
+        for w1, w2, w3, pos1, pos2, pos3 in zip(words, words[1:], words[2:], pos, pos[1:], pos[2:]):
             # prüfe auf analytisches Futur: ir (AUX + Tense) + a + Infinitiv
+            if pos1 != "AUX" or pos2 != "ADP" or pos3 != "VERB":
+                continue
+            morph1 = w1.get("morph", {})
             if (
-                pos1 == "AUX"
-                and "Tense" in morph1
-                and txt2 == "a"
-                and pos2 == "ADP"
-                and pos3 == "VERB"
-                and "Inf" in morph3.get("VerbForm", [])
+                "Tense" in morph1
+                and w2.get("text", "").lower() == "a"
+                and "Inf" in w3.get("morph", {}).get("VerbForm", [])
             ):
                 tense1 = morph1["Tense"]
                 label = None
@@ -288,15 +399,22 @@ def post_process_compound_futures(data: dict):
 # Hauptroutine: Entfernen + Annotation + Post-Processing
 # -----------------------------------------------------------------------------
 
-def annotate_file(path, progress):
-    data = json.load(open(path, "r", encoding="utf-8"))
+# Von der Annotation gesetzte Felder eines Wort-Objekts
+ANNOTATION_KEYS = ("pos", "lemma", "dep", "head_text", "morph")
+
+
+def prepare_file(data):
+    """
+    Teilt die Segmente der geladenen Daten einer Datei in Sätze. Alte
+    Annotationen werden bei der Annotation überschrieben (annotate_sentence).
+    Liefert (sentences, contexts); contexts[i] ist der spaCy-Eingabetext
+    (Satz-1 + Satz + Satz+1) für sentences[i], oder None, wenn der Satz nur aus
+    Wörtern besteht, die ohne spaCy behandelt werden (is_skipped_word).
+    """
     segs = data.get("segments", [])
-    # Alte Annotationen löschen
-    for s in segs:
-        for w in s.get("words", []):
-            for k in ("pos", "lemma", "dep", "head_text", "morph"):
-                w.pop(k, None)
-    # Annotation
+    # Kontexte sammeln: je Satz Satz-1 + Satz + Satz+1
+    sentences = []
+    contexts = []
     for s in segs:
         wl = s.get("words", [])
         if not wl:
@@ -304,63 +422,220 @@ def annotate_file(path, progress):
         sl = split_into_sentences(wl)
         for i, sent in enumerate(sl):
             ctx = (sl[i-1] if i>0 else []) + sent + (sl[i+1] if i<len(sl)-1 else [])
-            doc = nlp(" ".join(w.get("text", "").lower() for w in ctx))
-            tok = 0
-            for w in sent:
-                txt = w.get("text", "")
-                # foreign überspringen
-                if w.get("foreign") == "1":
-                    progress["annotated"] += 1
-                    continue
-                # Abgebrochene Wörter (inkl. nachfolgender Satzzeichen, z.B. "tu-,")
-                if txt.endswith("-"):
-                    w["pos"] = "self-correction"
-                    progress["annotated"] += 1
-                    show_progress(progress)
-                    continue
-                # Interjektion ee h
-                if txt.lower() == "eeh":
-                    w.update({"pos":"INTJ","lemma":txt,"dep":"","head_text":"","morph":{}})
-                    progress["annotated"] += 1
-                    continue
-                while tok<len(doc) and (doc[tok].is_punct or doc[tok].is_space):
-                    tok += 1
-                if (tok<len(doc) and
-                    strip_punct(doc[tok].text.lower()) == strip_punct(txt.lower())):
-                    fill_word_annotation(w, doc[tok])
-                    tok += 1
-                else:
-                    td = tok; found=False
-                    while td < len(doc):
-                        if (not(doc[td].is_punct or doc[td].is_space) and
-                            strip_punct(doc[td].text.lower()) == strip_punct(txt.lower())):
-                            fill_word_annotation(w, doc[td])
-                            td += 1; found=True; break
-                        td += 1
-                    tok = td
-                    if not found:
-                        fb = annotate_fallback(strip_punct(txt.lower()))
-                        w.update({
-                            "pos": fb["pos"],
-                            "lemma": fb["lemma"],
-                            "dep": fb["dep"],
-                            "head_text": fb["head_text"],
-                            "morph": fb["morph"]
-                        })
-                progress["annotated"] += 1
+            sentences.append(sent)
+            if all(is_skipped_word(w) for w in sent):
+                contexts.append(None)
+                continue
+            contexts.append(" ".join(w.get("text", "").lower() for w in ctx))
+    return sentences, contexts
+
+
+def annotate_sentence(sent, doc, progress, fallbacks):
+    """
+    Überträgt die Annotation der spaCy-Token aus doc auf die Wörter eines Satzes.
+    Wörter ohne passenden Token werden als (Wort-Objekt, Text) in fallbacks gesammelt.
+    doc ist None bei Sätzen, deren Kontext nicht geparst wurde (siehe prepare_file).
+    """
+    # Vergleichsschlüssel je Token einmal berechnen (kleingeschrieben, ohne
+    # Satzzeichen am Rand); None für Satzzeichen-/Leerraum-Token.
+    # lower_ liest die im Lexem bereits gespeicherte Kleinschreibung.
+    keys = [] if doc is None else [
+        None if (t.is_punct or t.is_space) else strip_punct(t.lower_)
+        for t in doc
+    ]
+    tok = 0
+    for w in sent:
+        txt = w.get("text", "")
+        # foreign überspringen (alte Annotation entfernen)
+        if w.get("foreign") == "1":
+            for k in ANNOTATION_KEYS:
+                w.pop(k, None)
+            progress["annotated"] += 1
+            continue
+        # Abgebrochene Wörter (inkl. nachfolgender Satzzeichen, z.B. "tu-,")
+        if txt.endswith("-"):
+            for k in ANNOTATION_KEYS:
+                w.pop(k, None)
+            w["pos"] = "self-correction"
+            progress["annotated"] += 1
+            show_progress(progress)
+            continue
+        txt_lc = txt.lower()
+        # Interjektion ee h
+        if txt_lc == "eeh":
+            w.update({"pos":"INTJ","lemma":txt,"dep":"","head_text":"","morph":{}})
+            progress["annotated"] += 1
+            continue
+        # Erster passender Token ab tok (Satzzeichen-Token haben den Schlüssel None)
+        word_key = strip_punct(txt_lc)
+        try:
+            td = keys.index(word_key, tok)
+        except ValueError:
+            tok = len(keys)
+            fallbacks.append((w, word_key))
+        else:
+            fill_word_annotation(w, doc[td])
+            tok = td + 1
+        progress["annotated"] += 1
+
+
+def finish_file(path, data, fallbacks, compact=False, writer=None):
+    """
+    Parst die Fallback-Wörter, führt das Post-Processing aus und speichert die Datei.
+    Mit writer (Executor) wird das Speichern dort eingereicht und das Future
+    zurückgegeben; data darf danach nicht mehr verändert werden.
+    """
+    # Fallback-Wörter einzeln parsen: bekannte Wortformen aus dem Cache,
+    # neue Wortformen jeweils einmal, gebündelt
+    annotations = {}
+    new_texts = []
+    for _, word_text in fallbacks:
+        if word_text not in annotations:
+            fb = _fallback_cache.get(word_text)
+            if fb is None:
+                new_texts.append(word_text)
+            annotations[word_text] = fb
+    for word_text, doc in zip(new_texts, nlp.pipe(new_texts, batch_size=SPACY_BATCH_SIZE)):
+        fb = annotate_fallback(doc, word_text)
+        annotations[word_text] = fb
+        if len(_fallback_cache) < FALLBACK_CACHE_SIZE:
+            _fallback_cache[word_text] = fb
+    for w, word_text in fallbacks:
+        fb = annotations[word_text]
+        w.update({
+            "pos": fb["pos"],
+            "lemma": fb["lemma"],
+            "dep": fb["dep"],
+            "head_text": fb["head_text"],
+            # eigene Kopie je Wort, das Post-Processing ergänzt morph
+            "morph": dict(fb["morph"])
+        })
 
     # Post-Processing
     post_process_compound_tenses(data)
     post_process_compound_futures(data)
 
     # Speichern
-    json.dump(data, open(path, "w", encoding="utf-8"), ensure_ascii=False, indent=2)
+    if writer is not None:
+        return writer.submit(save_json, path, data, compact)
+    save_json(path, data, compact)
+    return None
+
+
+def iter_contexts(paths, prepared):
+    """
+    Lädt und bereitet die Dateien nacheinander vor und liefert (Kontext, (Pfad, Satzindex))
+    für nlp.pipe(as_tuples=True); in prepared[Pfad] landen (data, sentences, sources, shared).
+    Sätze ohne Kontext (None) werden nicht an spaCy übergeben, identische Kontexte
+    innerhalb einer Datei nur einmal: sources[i] ist der Index des Satzes, dessen
+    Doc Satz i verwendet (i selbst, ein früherer Satz mit gleichem Kontext oder
+    None); shared enthält die Indizes, deren Doc später erneut gebraucht wird.
+    """
+    for path in paths:
+        data = load_json(path)
+        sentences, contexts = prepare_file(data)
+        first = {}
+        sources = [None if ctx is None else first.setdefault(ctx, i) for i, ctx in enumerate(contexts)]
+        shared = {src for i, src in enumerate(sources) if src is not None and src != i}
+        prepared[path] = (data, sentences, sources, shared)
+        for sent_idx, ctx in enumerate(contexts):
+            if sources[sent_idx] == sent_idx:
+                yield ctx, (path, sent_idx)
+
+
+# Höchstzahl fertig annotierter Dateien, die gleichzeitig auf das Speichern warten
+MAX_PENDING_WRITES = 2
+
+
+def annotate_files(file_info, progress, n_process=1, compact=False):
+    """
+    Annotiert alle Dateien aus file_info (Liste von (Pfad, Wortanzahl)) über
+    einen gemeinsamen nlp.pipe-Strom, damit spaCy dateiübergreifend bündeln und
+    auf n_process Prozesse verteilen kann.
+    nlp.pipe liefert die Docs in Eingabereihenfolge; sobald der erste Satz einer
+    neuen Datei ankommt, sind alle vorherigen Dateien vollständig und werden
+    abgeschlossen und gespeichert. Das Speichern läuft in Hintergrund-Threads,
+    parallel zur Annotation der nächsten Datei.
+    """
+    prepared = {}
+    paths = [path for path, _ in file_info]
+    stream = nlp.pipe(
+        iter_contexts(paths, prepared),
+        as_tuples=True,
+        batch_size=SPACY_BATCH_SIZE,
+        n_process=n_process,
+    )
+
+    def start(path, words_in_file):
+        print(f"\nBearbeite Datei: {os.path.basename(path)}  ({words_in_file} Wörter)")
+
+    def annotate_until(path, done, stop, docs, fallbacks):
+        # Sätze ohne eigenes Doc (Index done bis stop) in Reihenfolge annotieren:
+        # ohne Kontext (None) oder mit dem Doc des früheren Satzes mit gleichem Kontext
+        _, sentences, sources, _ = prepared[path]
+        for i in range(done, stop):
+            src = sources[i]
+            annotate_sentence(sentences[i], None if src is None else docs[src], progress, fallbacks)
+
+    writer = ThreadPoolExecutor(max_workers=MAX_PENDING_WRITES)
+    pending = deque()
+
+    def finish(path, done, docs, fallbacks):
+        annotate_until(path, done, len(prepared[path][1]), docs, fallbacks)
+        data = prepared.pop(path)[0]
+        pending.append(finish_file(path, data, fallbacks, compact, writer))
+        # Rückstau begrenzen (und Schreibfehler früh melden)
+        while len(pending) > MAX_PENDING_WRITES:
+            pending.popleft().result()
+        file_finished_message(progress)
+
+    remaining = iter(file_info)
+    current = None
+    done, docs, fallbacks = 0, {}, []
+    try:
+        for doc, (path, sent_idx) in stream:
+            # Dateien ohne Docs (keine oder nur übersprungene Sätze) werden hier mit abgeschlossen
+            while current != path:
+                if current is not None:
+                    finish(current, done, docs, fallbacks)
+                    done, docs, fallbacks = 0, {}, []
+                current, words_in_file = next(remaining)
+                start(current, words_in_file)
+            annotate_until(path, done, sent_idx, docs, fallbacks)
+            _, sentences, _, shared = prepared[path]
+            annotate_sentence(sentences[sent_idx], doc, progress, fallbacks)
+            if sent_idx in shared:
+                docs[sent_idx] = doc
+            done = sent_idx + 1
+
+        if current is not None:
+            finish(current, done, docs, fallbacks)
+        for path, words_in_file in remaining:
+            start(path, words_in_file)
+            finish(path, 0, {}, [])
+    finally:
+        # Bereits eingereichte Dateien in jedem Fall fertig schreiben
+        writer.shutdown(wait=True)
+    for future in pending:
+        future.result()
 
 # -----------------------------------------------------------------------------
 # Main: Auswahl und Durchlauf
 # -----------------------------------------------------------------------------
 
 def main():
+    parser = argparse.ArgumentParser(description="Annotiert die JSON-Dateien in grabaciones/ mit spaCy.")
+    parser.add_argument(
+        "--n-process", type=int, default=1,
+        help="Anzahl paralleler spaCy-Prozesse für nlp.pipe (Standard: 1; "
+             "jeder Prozess lädt eine eigene Modellkopie, nicht mit GPU kombinieren)"
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="JSON kompakt ohne Einrückung speichern (kleiner und schneller geschrieben)"
+    )
+    args = parser.parse_args()
+
     # Pfadcheck
     if not os.path.isdir(GRABACIONES_DIR):
         print(f"Ordner '{GRABACIONES_DIR}' nicht gefunden (erwartet in: {GRABACIONES_DIR})")
@@ -383,27 +658,24 @@ def main():
     overwrite_choice = input("Sollen bestehende Annotationen überschrieben werden? (ja/nein): ").strip().lower()
     overwrite_existing = overwrite_choice == "ja"
 
-    # Wortzählung
+    # Wortzählung (quick_scan)
     total_words_to_annotate = 0
-    filtered_files = []
+    file_info = []  # (Pfad, Wortanzahl) der zu annotierenden Dateien
 
     for fname in files_to_process:
         file_path = os.path.join(GRABACIONES_DIR, fname)
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            segments = data.get("segments", [])
-            if not overwrite_existing and already_annotated(segments):
-                print(f"Datei {fname} ist bereits annotiert, wird übersprungen.")
-                continue
-            filtered_files.append(fname)
-            for seg in segments:
-                total_words_to_annotate += len(seg.get("words", []))
+        annotated, words = quick_scan(file_path, check_annotated=not overwrite_existing)
+        if annotated:
+            print(f"Datei {fname} ist bereits annotiert, wird übersprungen.")
+            continue
+        file_info.append((file_path, words))
+        total_words_to_annotate += words
 
-    if not filtered_files:
+    if not file_info:
         print("Keine Dateien zum Annotieren gefunden.")
         return
 
-    print(f"Insgesamt {len(filtered_files)} JSON-Dateien mit {total_words_to_annotate} Wörtern zu annotieren...")
+    print(f"Insgesamt {len(file_info)} JSON-Dateien mit {total_words_to_annotate} Wörtern zu annotieren...")
 
     progress_data = {
         "annotated": 0,
@@ -411,15 +683,15 @@ def main():
         "last_step": 0  # Für 2500er-Schritte
     }
 
+    # Modell erst jetzt laden (nicht bei Abbruch oder wenn alles annotiert ist)
+    load_nlp()
+    n_process = args.n_process
+    if USING_GPU and n_process > 1:
+        print("GPU aktiv: --n-process wird ignoriert, Verarbeitung in einem Prozess.")
+        n_process = 1
+
     # Bearbeitung
-    for fname in filtered_files:
-        file_path = os.path.join(GRABACIONES_DIR, fname)
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            words_in_file = sum(len(seg.get("words", [])) for seg in data.get("segments", []))
-        print(f"\nBearbeite Datei: {fname}  ({words_in_file} Wörter)")
-        annotate_file(file_path, progress_data)
-        file_finished_message(progress_data)
+    annotate_files(file_info, progress_data, n_process=n_process, compact=args.compact)
 
     print("\nAlle gewünschten Dateien wurden bearbeitet.")
     print(f"Insgesamt {progress_data['annotated']} Wörter annotiert.")
@@ -16,24 +16,67 @@ Erstellt und aktualisiert mehrere SQLite-Datenbanken aus allen JSON-Dateien im O
 """
 
 import os
+import argparse
 import json
 import sqlite3
 import hashlib
 import string
-from collections import OrderedDict
+import codecs
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # ----------------------------------------------------------------------
 # Hilfsfunktionen
 # ----------------------------------------------------------------------
+def load_json(path):
+    """
+    Liest eine JSON-Datei (UTF-8, ggf. mit BOM); nutzt orjson, falls verfügbar.
+    orjson parst direkt aus einem Memory-Map der Datei, ohne die Bytes vorher
+    vollständig in den Speicher zu kopieren.
+    """
+    if HAS_ORJSON:
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return orjson.loads(b'')  # mmap kann leere Dateien nicht abbilden
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    skip = len(codecs.BOM_UTF8) if view[:3] == codecs.BOM_UTF8 else 0
+                    with view[skip:] as body:
+                        return orjson.loads(body)
+    with open(path, 'r', encoding='utf-8-sig') as file:
+        return json.load(file)
+
+def save_json(path, data):
+    """
+    Schreibt eine JSON-Datei (UTF-8, 2 Leerzeichen Einrückung); nutzt orjson, falls verfügbar.
+    Geschrieben wird in eine temporäre Datei, die danach atomar umbenannt wird,
+    damit ein Abbruch keine halb geschriebene Korpusdatei hinterlässt.
+    """
+    tmp_path = f"{path}.tmp"
+    if HAS_ORJSON:
+        Path(tmp_path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
 def seconds_to_hms(seconds):
-    hrs, r = divmod(seconds, 3600)
+    # Ganze Sekunden reichen: die Nachkommastellen werden ohnehin abgeschnitten
+    hrs, r = divmod(int(seconds), 3600)
     mins, secs = divmod(r, 60)
-    return f"{int(hrs):02d}:{int(mins):02d}:{int(secs):02d}"
+    return "%02d:%02d:%02d" % (hrs, mins, secs)
 
 def seconds_to_hms_files(seconds):
     hrs, r = divmod(seconds, 3600)
     mins, secs = divmod(r, 60)
-    return f"{int(hrs):02d}:{int(mins):02d}:{secs:.2f}"
+    return "%02d:%02d:%.2f" % (hrs, mins, secs)
 
 def is_sentence_boundary(word_text):
     """Prüft, ob ein Wort mit Satzschlusszeichen (., !, ?) endet."""
@@ -61,51 +104,71 @@ def map_speaker_attributes(name):
     }
     return mapping.get(name, ('','', '',''))
 
-def get_left_with_sentence_bounds(words, center_index, max_count=10):
+def sentence_bounds(words):
+    """
+    Bestimmt einmal pro Segment für jedes Token die Position der vorangehenden
+    und der folgenden Satzgrenze (., !, ?). Liefert (is_bound, prev_bound, next_bound);
+    fehlt eine Grenze, steht -1 bzw. len(words).
+    """
+    is_bound = [is_sentence_boundary(w.get('text','')) for w in words]
+    n = len(words)
+    prev_bound = [-1] * n
+    next_bound = [n] * n
+    last = -1
+    for idx in range(n):
+        prev_bound[idx] = last
+        if is_bound[idx]:
+            last = idx
+    last = n
+    for idx in range(n - 1, -1, -1):
+        next_bound[idx] = last
+        if is_bound[idx]:
+            last = idx
+    return is_bound, prev_bound, next_bound
+
+def get_left_with_sentence_bounds(words, bounds, center_index, max_count=10):
     """
     Nimmt bis zu max_count Tokens links, stoppt jedoch an Satzgrenze (., !, ?).
     Die satzabschließende Token wird nicht mehr in den linken Kontext aufgenommen.
+    bounds ist das Ergebnis von sentence_bounds(words).
     """
-    result = []
-    steps = 0
-    idx = center_index - 1
-    while idx >= 0 and steps < max_count:
-        if is_sentence_boundary(words[idx].get('text','')):
-            break
-        result.append(words[idx])
-        steps += 1
-        idx -= 1
-    result.reverse()
-    return result
-
-def get_right_with_sentence_bounds(words, center_index, max_count=10):
+    prev_bound = bounds[1][center_index]
+    return words[max(prev_bound + 1, center_index - max_count):center_index]
+
+def get_right_with_sentence_bounds(words, bounds, center_index, max_count=10):
     """
     Nimmt bis zu max_count Tokens rechts, stoppt nach dem ersten Token, das Satzende ist (oder einschließt).
     NEU: Wenn das aktuelle Token selbst (center_index) ein Satzende hat, gibt es gar keinen rechten Kontext.
+    bounds ist das Ergebnis von sentence_bounds(words).
     """
-    if is_sentence_boundary(words[center_index].get('text','')):
+    is_bound, _, next_bound = bounds
+    if is_bound[center_index]:
         return []
+    return words[center_index + 1:min(next_bound[center_index] + 1, center_index + 1 + max_count)]
 
-    result = []
-    steps = 0
-    idx = center_index + 1
-    while idx < len(words) and steps < max_count:
-        w_text = words[idx].get('text','')
-        result.append(words[idx])
-        steps += 1
-        if is_sentence_boundary(w_text):
-            break
-        idx += 1
-    return result
-
-def build_string_context(word_list):
-    return ' '.join(w.get('text','') for w in word_list)
+def neighbor_json(w):
+    """
+    JSON eines Wortes für neighbors_left/neighbors_right – identisch zu einem
+    Listenelement von json.dumps(..., ensure_ascii=False).
+    """
+    return json.dumps({
+        "text": w.get('text',''),
+        "lemma": w.get('lemma',''),
+        "pos": w.get('pos',''),
+        "dep": w.get('dep',''),
+        "start": w.get('start',0.0),
+        "end": w.get('end',0.0)
+    }, ensure_ascii=False)
 
 # Adaptive Token-ID-Funktion: Zunächst 5 Hash-Zeichen; bei Kollision sukzessive verlängern.
-def generate_unique_token_id(country_code, date, st, et, text, existing_ids):
-    text_part = text[:3] if len(text) >= 3 else text
-    composite = f"{date}_{st}_{et}_{text_part}"
-    hash_full = hashlib.md5(composite.encode('utf-8')).hexdigest()
+# token_hash() ist dateiweise unabhängig (läuft in den Worker-Prozessen), die
+# Kollisionsauflösung in generate_unique_token_id() braucht alle bisher vergebenen IDs.
+# Bewusst MD5: die IDs stehen bereits in den JSON-Dateien und werden bei jedem Lauf
+# neu berechnet – ein anderer Hash würde DB und JSON auseinanderlaufen lassen.
+def token_hash(date, st, et, text):
+    return hashlib.md5(f"{date}_{st}_{et}_{text[:3]}".encode('utf-8')).hexdigest()
+
+def generate_unique_token_id(country_code, hash_full, existing_ids):
     hash_len = 5
     token_id = f"{country_code}{hash_full[:hash_len]}"
     extension_count = 0
@@ -116,17 +179,33 @@ def generate_unique_token_id(country_code, date, st, et, text, existing_ids):
     existing_ids.add(token_id)
     return token_id, extension_count
 
-def insert_token_id_after_text(word, token_id):
-    new_word = OrderedDict()
-    inserted = False
-    for key, value in word.items():
-        new_word[key] = value
-        if key == "text" and not inserted:
-            new_word["token_id"] = token_id
-            inserted = True
-    if not inserted:
-        new_word["token_id"] = token_id
-    return new_word
+def set_pragmas(conn, schema, bulk):
+    """Setzt die Schreib-Einstellungen (siehe connect_db) für eine Datenbank der Verbindung."""
+    conn.execute(f"PRAGMA {schema}.cache_size=-262144")  # 256 MiB
+    if bulk:
+        conn.execute(f"PRAGMA {schema}.synchronous=OFF")
+    else:
+        conn.execute(f"PRAGMA {schema}.synchronous=NORMAL")
+
+def connect_db(db_path, bulk=False):
+    """
+    Öffnet eine SQLite-Datenbank mit Einstellungen für schnelles Schreiben
+    (großer Seiten-Cache, temporäre Daten im Speicher, synchronous=NORMAL).
+    bulk=True für Datenbanken, deren Tabellen komplett neu aufgebaut werden: kein
+    fsync. Das Rollback-Journal bleibt auf der Platte (journal_mode=DELETE), damit
+    ein abgebrochener Lauf (Kill, Speichermangel) beim nächsten Öffnen
+    zurückgerollt wird und die vorherigen Tabellen erhalten bleiben; gegen
+    Stromausfall oder Systemabsturz schützt synchronous=OFF nicht.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA temp_store=MEMORY")
+    set_pragmas(conn, "main", bulk)
+    return conn
+
+def attach_db(conn, db_path, schema, bulk=False):
+    """Hängt eine weitere Datenbank unter dem Namen schema an conn an (Einstellungen wie connect_db)."""
+    conn.execute(f"ATTACH DATABASE ? AS {schema}", (db_path,))
+    set_pragmas(conn, schema, bulk)
 
 
 # ----------------------------------------------------------------------
@@ -139,13 +218,37 @@ DB_DIR = os.path.join(BASE_WEB, "db")
 DB_PUBLIC_DIR = os.path.join(BASE_WEB, "db_public")
 GRABACIONES_DIR = os.path.join(BASE_WEB, "grabaciones")
 
+# ----------------------------------------------------------------------
+# Kennzahlen je Datei für die Statistik-Datenbanken (1-3)
+# ----------------------------------------------------------------------
+def summarize_file(jf, data):
+    """Liefert Metadaten, Wortzahl und maximales Wortende ('max_end') einer geladenen Datei."""
+    word_count = 0
+    max_end = 0.0
+    for seg in data.get('segments', []):
+        wds = seg.get('words', [])
+        word_count += len(wds)
+        if wds:
+            e = wds[-1].get('end', 0.0)
+            if e > max_end:
+                max_end = e
+    return {
+        'filename': os.path.basename(jf),
+        'country': data.get('country', ''),
+        'radio': data.get('radio', ''),
+        'date': data.get('date', ''),
+        'revision': data.get('revision', ''),
+        'word_count': word_count,
+        'max_end': max_end,
+    }
+
 # ----------------------------------------------------------------------
 # 1) stats_all.db
 # ----------------------------------------------------------------------
-def run_stats_all():
+def run_stats_all(summaries):
     os.makedirs(DB_PUBLIC_DIR, exist_ok=True)
     db_path = os.path.join(DB_PUBLIC_DIR, 'stats_all.db')
-    conn = sqlite3.connect(db_path)
+    conn = connect_db(db_path)
     c = conn.cursor()
     c.execute('''
         CREATE TABLE IF NOT EXISTS stats (
@@ -155,26 +258,8 @@ def run_stats_all():
         )
     ''')
 
-    folder = GRABACIONES_DIR
-    json_files = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.json')]
-
-    total_word_count = 0
-    max_end_times = []
-
-    for jf in json_files:
-        with open(jf, 'r', encoding='utf-8-sig') as file:
-            data = json.load(file)
-            max_end_time = 0.0
-            for seg in data.get('segments', []):
-                wds = seg.get('words', [])
-                total_word_count += len(wds)
-                if wds:
-                    e = wds[-1].get('end', 0.0)
-                    if e > max_end_time:
-                        max_end_time = e
-            max_end_times.append(max_end_time)
-
-    total_dur = seconds_to_hms(sum(max_end_times))
+    total_word_count = sum(s['word_count'] for s in summaries)
+    total_dur = seconds_to_hms(sum(s['max_end'] for s in summaries))
 
     c.execute("SELECT id FROM stats WHERE id=1")
     row_exists = c.fetchone()
@@ -200,10 +285,10 @@ def run_stats_all():
 # ----------------------------------------------------------------------
 # 2) stats_country.db
 # ----------------------------------------------------------------------
-def run_stats_country():
+def run_stats_country(summaries):
     os.makedirs(DB_DIR, exist_ok=True)           
     db_path = os.path.join(DB_DIR, 'stats_country.db')
-    conn = sqlite3.connect(db_path)
+    conn = connect_db(db_path, bulk=True)
     c = conn.cursor()
 
     c.execute("DROP TABLE IF EXISTS stats_country")
@@ -216,41 +301,22 @@ def run_stats_country():
         )
     ''')
 
-    folder = GRABACIONES_DIR
-    json_files = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.json')]
-
     cdict = {}  # country -> [acc_words, acc_time]
 
-    for jf in json_files:
-        with open(jf, 'r', encoding='utf-8-sig') as file:
-            data = json.load(file)
-            country_val = data.get("country", "")
-            if not country_val:
-                country_val = "UNK"
-
-            total_w = 0
-            max_end_time = 0.0
-            for seg in data.get('segments', []):
-                wds = seg.get('words', [])
-                total_w += len(wds)
-                if wds:
-                    e = wds[-1].get('end', 0.0)
-                    if e > max_end_time:
-                        max_end_time = e
-
-            if country_val not in cdict:
-                cdict[country_val] = [0, 0.0]
-            cdict[country_val][0] += total_w
-            cdict[country_val][1] += max_end_time
-
-    inserted_count = 0
-    for country_key, (wc, total_end) in cdict.items():
-        dur_str = seconds_to_hms(total_end)
-        c.execute('''
-            INSERT INTO stats_country (country, total_word_count, total_duration_country)
-            VALUES (?, ?, ?)
-        ''', (country_key, wc, dur_str))
-        inserted_count += 1
+    for s in summaries:
+        acc = cdict.setdefault(s['country'] or "UNK", [0, 0.0])
+        acc[0] += s['word_count']
+        acc[1] += s['max_end']
+
+    rows = [
+        (country_key, wc, seconds_to_hms(total_end))
+        for country_key, (wc, total_end) in cdict.items()
+    ]
+    c.executemany('''
+        INSERT INTO stats_country (country, total_word_count, total_duration_country)
+        VALUES (?, ?, ?)
+    ''', rows)
+    inserted_count = c.rowcount
 
     conn.commit()
     conn.close()
@@ -259,10 +325,10 @@ def run_stats_country():
 # ----------------------------------------------------------------------
 # 3) stats_files.db
 # ----------------------------------------------------------------------
-def run_stats_files():
+def run_stats_files(summaries):
     os.makedirs(DB_DIR, exist_ok=True)
     db_path = os.path.join(DB_DIR, 'stats_files.db')
-    conn = sqlite3.connect(db_path)
+    conn = connect_db(db_path)
     c = conn.cursor()
     c.execute('''
         CREATE TABLE IF NOT EXISTS metadata (
@@ -277,49 +343,31 @@ def run_stats_files():
         )
     ''')
 
-    folder = GRABACIONES_DIR
-    json_files = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.json')]
-
-    updated_count = 0
-    inserted_count = 0
-
-    for jf in json_files:
-        basef = os.path.basename(jf)
-        with open(jf, 'r', encoding='utf-8-sig') as file:
-            data = json.load(file)
-            country = data.get('country','')
-            radio = data.get('radio','')
-            date = data.get('date','')
-            revision = data.get('revision','')
-
-            segs = data.get('segments', [])
-            wc = sum(len(s.get('words', [])) for s in segs)
-            last_end = 0.0
-            for seg in segs:
-                wds = seg.get('words', [])
-                if wds:
-                    e = wds[-1].get('end',0.0)
-                    if e>last_end:
-                        last_end = e
-            dur_str = seconds_to_hms_files(last_end)
-
-            c.execute("SELECT id FROM metadata WHERE filename=?", (basef,))
-            row = c.fetchone()
-            if row:
-                c.execute('''
-                    UPDATE metadata
-                    SET country=?, radio=?, date=?, revision=?, word_count=?, duration=?
-                    WHERE filename=?
-                ''', (country, radio, date, revision, wc, dur_str, basef))
-                if c.rowcount > 0:
-                    updated_count += 1
-            else:
-                c.execute('''
-                    INSERT INTO metadata (filename, country, radio, date, revision, word_count, duration)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (basef, country, radio, date, revision, wc, dur_str))
-                if c.rowcount > 0:
-                    inserted_count += 1
+    rows = [
+        (s['filename'], s['country'], s['radio'], s['date'], s['revision'],
+         s['word_count'], seconds_to_hms_files(s['max_end']))
+        for s in summaries
+    ]
+
+    # Vorhandene Dateinamen einmal lesen: neue Dateien einfügen, vorhandene nur bei
+    # geänderten Werten überschreiben. Kein INSERT ... ON CONFLICT, da jeder
+    # Konfliktversuch einen AUTOINCREMENT-Wert verbrauchen würde.
+    existing = {fn for (fn,) in c.execute("SELECT filename FROM metadata")}
+    insert_rows = [row for row in rows if row[0] not in existing]
+    update_rows = [row[1:] + row for row in rows if row[0] in existing]
+
+    c.executemany('''
+        UPDATE metadata
+        SET country=?, radio=?, date=?, revision=?, word_count=?, duration=?
+        WHERE filename=?
+          AND (country, radio, date, revision, word_count, duration) IS NOT (?, ?, ?, ?, ?, ?)
+    ''', update_rows)
+    updated_count = c.rowcount
+    c.executemany('''
+        INSERT INTO metadata (filename, country, radio, date, revision, word_count, duration)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', insert_rows)
+    inserted_count = c.rowcount
 
     conn.commit()
     conn.close()
@@ -333,20 +381,58 @@ def run_stats_files():
 # 4) transcription.db: Neue Spalte lemma in tokens
 #    annotation_data.db: Neue Spalte foreign_word in annotations
 # ----------------------------------------------------------------------
-def run_transcription():
+IGNORED_TOKENS = frozenset({"(", ")", "[", "]", "!", "(..)", "(.)", "(..", "(..).", "(..),", ").", ")]", ",", "."})
+# Entfernt alle Satzzeichen; bleibt nichts übrig, besteht das Token nur aus Satzzeichen
+PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+INSERT_TOKENS_SQL = '''
+    INSERT INTO main.tokens (
+        token_id, filename, country_code, radio, date,
+        speaker_type, sex, mode, discourse,
+        text, start, end,
+        context_left, context_right,
+        context_start, context_end,
+        lemma
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_ANNOTATIONS_SQL = '''
+    INSERT INTO ann.annotations (
+        token_id, segment_index, token_index,
+        lemma, pos, dep, head_text, morph,
+        neighbors_left, neighbors_right,
+        foreign_word
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def open_transcription():
+    """
+    Legt transcription.db und annotation_data.db neu an und liefert den
+    Zustand (Verbindung, vergebene IDs, Zähler) für transcribe_file().
+    annotation_data.db wird als Schema 'ann' an die Verbindung zu
+    transcription.db angehängt, sodass beide in einer Transaktion gefüllt werden.
+    Die Transaktion wird explizit gesteuert (isolation_level=None): BEGIN hier,
+    COMMIT in close_transcription(). Bricht der Prozess vorher ab, rollt SQLite
+    beide Datenbanken über ihr Journal auf den vorherigen Stand zurück.
+    """
     os.makedirs(DB_DIR, exist_ok=True)
     
     transcription_db_path = os.path.join(DB_DIR, 'transcription.db')
     annotation_db_path   = os.path.join(DB_DIR, 'annotation_data.db')
     
+    conn = connect_db(transcription_db_path, bulk=True)
+    conn.isolation_level = None
+    attach_db(conn, annotation_db_path, "ann", bulk=True)  # ATTACH nur außerhalb einer Transaktion
+    conn.execute("BEGIN IMMEDIATE")
+    c = conn.cursor()
+    
     # ---- transcription.db ----
-    conn_trans = sqlite3.connect(transcription_db_path)
-    c_trans = conn_trans.cursor()
-    c_trans.execute("DROP TABLE IF EXISTS tokens")
-    c_trans.execute('''
-        CREATE TABLE tokens (
+    c.execute("DROP TABLE IF EXISTS main.tokens")
+    c.execute('''
+        CREATE TABLE main.tokens (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            token_id TEXT UNIQUE,
+            token_id TEXT,                -- UNIQUE-Index wird nach dem Einfügen erstellt
             filename TEXT,
             country_code TEXT,
             radio TEXT,
@@ -365,15 +451,12 @@ def run_transcription():
             lemma TEXT
         )
     ''')
-    c_trans.execute("CREATE INDEX idx_tokens_token_id ON tokens(token_id)")
     
     # ---- annotation_data.db ----
-    conn_ann = sqlite3.connect(annotation_db_path)
-    c_ann = conn_ann.cursor()
-    c_ann.execute("DROP TABLE IF EXISTS annotations")
-    c_ann.execute('''
-        CREATE TABLE annotations (
-            token_id TEXT UNIQUE,
+    c.execute("DROP TABLE IF EXISTS ann.annotations")
+    c.execute('''
+        CREATE TABLE ann.annotations (
+            token_id TEXT,          -- UNIQUE-Index wird nach dem Einfügen erstellt
             segment_index INTEGER,
             token_index INTEGER,
             lemma TEXT,
@@ -386,154 +469,176 @@ def run_transcription():
             foreign_word TEXT       -- Neu für Fremdwörter: "1" oder "0"
         )
     ''')
-    c_ann.execute("CREATE INDEX idx_annotations_token_id ON annotations(token_id)")
     
-    folder = GRABACIONES_DIR
-    json_files = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.json')]
-    inserted = 0
+    return {
+        "conn": conn,
+        "existing_ids": set(),
+        "inserted": 0,
+        "empty_tokens": 0,
+        "extensions": 0,
+    }
+
+def prepare_tokens(jf, data):
+    """
+    Bereitet die Token einer geladenen Datei für transcription.db und
+    annotation_data.db vor – alles außer der token_id, die erst
+    transcribe_file() vergibt.
+    Liefert (tokens, missing, empty_tokens_count): tokens ist eine Liste von
+    (hash_full, tokens-Zeile, annotations-Zeile) jeweils ohne token_id;
+    missing enthält (k, seg_i, i) für tokens[k], deren Wort im JSON noch keine
+    token_id hat.
+    """
     empty_tokens_count = 0
-    total_extensions = 0
+    tokens = []
+    missing = []
     
-    existing_ids = set()
-    ignored_tokens = {"(", ")", "[", "]", "!", "(..)", "(.)", "(..", "(..).", "(..),", ").", ")]", ",", "."}
+    basef = os.path.basename(jf)
+    real_fname = data.get('filename', basef)
+    code_val = data.get("country_code", "UNK")
+    radio = data.get('radio','')
+    date = data.get('date','')
     
-    for jf in json_files:
-        basef = os.path.basename(jf)
-        with open(jf, 'r', encoding='utf-8-sig') as file:
-            data = json.load(file)
-        json_modified = False
-        real_fname = data.get('filename', basef)
-        code_val = data.get("country_code", "UNK")
-        radio = data.get('radio','')
-        date = data.get('date','')
-        
-        # Sprecher-Mapping
-        spk_map = {}
-        for sp in data.get('speakers', []):
-            sid = sp.get('spkid')
-            sname = sp.get('name')
-            if sid:
-                spk_map[sid] = sname
+    # Sprecher-Mapping
+    spk_map = {}
+    for sp in data.get('speakers', []):
+        sid = sp.get('spkid')
+        sname = sp.get('name')
+        if sid:
+            spk_map[sid] = sname
+    
+    segments = data.get('segments', [])
+    for seg_i, seg in enumerate(segments):
+        spkid = seg.get('speaker')
+        spkname = spk_map.get(spkid, '')
+        speaker_type, sex, mode, discourse = map_speaker_attributes(spkname)
         
-        segments = data.get('segments', [])
-        for seg_i, seg in enumerate(segments):
-            spkid = seg.get('speaker')
-            spkname = spk_map.get(spkid, '')
-            speaker_type, sex, mode, discourse = map_speaker_attributes(spkname)
+        wlist = seg.get('words', [])
+        bounds = sentence_bounds(wlist)
+        # Nachbar-JSON je Wort einmal erzeugen; die Listen der Kontextfenster werden daraus zusammengesetzt
+        nb_json = [neighbor_json(w) for w in wlist]
+        texts = [w.get('text','') for w in wlist]
+        for i, w_obj in enumerate(wlist):
+            txt = w_obj.get('text','').strip()
+            if txt in IGNORED_TOKENS or (txt and not txt.translate(PUNCT_TABLE)):
+                empty_tokens_count += 1
+                continue
+            
+            # Lemma, POS etc. aus dem JSON
+            lem = w_obj.get('lemma','')
+            pos = w_obj.get('pos','')
+            dep = w_obj.get('dep','')
+            head = w_obj.get('head_text','')
+            morph = w_obj.get('morph', {})
+            morph_json = '{}' if morph == {} else json.dumps(morph, ensure_ascii=False)
+            
+            # Fremdwörterkennzeichnung aus JSON, Standardwert "0"
+            foreign_val = w_obj.get('foreign', '0')
+            
+            st = w_obj.get('start', 0.0)
+            et = w_obj.get('end', 0.0)
+            
+            left_tokens = get_left_with_sentence_bounds(wlist, bounds, i, max_count=10)
+            right_tokens = get_right_with_sentence_bounds(wlist, bounds, i, max_count=10)
+            
+            left_from = i - len(left_tokens)
+            right_to = i + 1 + len(right_tokens)
+            nb_left_str = "[" + ", ".join(nb_json[left_from:i]) + "]"
+            nb_right_str = "[" + ", ".join(nb_json[i + 1:right_to]) + "]"
+            
+            ctx_left_str = ' '.join(texts[left_from:i])
+            ctx_right_str = ' '.join(texts[i + 1:right_to])
+            
+            if left_tokens:
+                ctx_start = max(0, left_tokens[0].get('start', st) - 0.25)
+            else:
+                ctx_start = max(0, st - 0.25)
+            if right_tokens:
+                ctx_end = right_tokens[-1].get('end', et) + 0.25
+            else:
+                ctx_end = et + 0.25
+            
+            # JSON später ergänzen, falls token_id noch nicht da
+            if "token_id" not in w_obj:
+                missing.append((len(tokens), seg_i, i))
             
-            wlist = seg.get('words', [])
-            for i, w_obj in enumerate(wlist):
-                txt = w_obj.get('text','').strip()
-                if txt in ignored_tokens or (txt and all(ch in string.punctuation for ch in txt)):
-                    empty_tokens_count += 1
-                    continue
-                
-                # Lemma, POS etc. aus dem JSON
-                lem = w_obj.get('lemma','')
-                pos = w_obj.get('pos','')
-                dep = w_obj.get('dep','')
-                head = w_obj.get('head_text','')
-                morph_json = json.dumps(w_obj.get('morph', {}), ensure_ascii=False)
-                
-                # Fremdwörterkennzeichnung aus JSON, Standardwert "0"
-                foreign_val = w_obj.get('foreign', '0')
-                
-                st = w_obj.get('start', 0.0)
-                et = w_obj.get('end', 0.0)
-                
-                left_tokens = get_left_with_sentence_bounds(wlist, i, max_count=10)
-                right_tokens = get_right_with_sentence_bounds(wlist, i, max_count=10)
-                
-                nb_left = [{
-                    "text": lw.get('text',''),
-                    "lemma": lw.get('lemma',''),
-                    "pos": lw.get('pos',''),
-                    "dep": lw.get('dep',''),
-                    "start": lw.get('start',0.0),
-                    "end": lw.get('end',0.0)
-                } for lw in left_tokens]
-                
-                nb_right = [{
-                    "text": rw.get('text',''),
-                    "lemma": rw.get('lemma',''),
-                    "pos": rw.get('pos',''),
-                    "dep": rw.get('dep',''),
-                    "start": rw.get('start',0.0),
-                    "end": rw.get('end',0.0)
-                } for rw in right_tokens]
-                
-                nb_left_str = json.dumps(nb_left, ensure_ascii=False)
-                nb_right_str = json.dumps(nb_right, ensure_ascii=False)
-                
-                ctx_left_str = build_string_context(left_tokens)
-                ctx_right_str = build_string_context(right_tokens)
-                
-                if left_tokens:
-                    ctx_start = max(0, left_tokens[0].get('start', st) - 0.25)
-                else:
-                    ctx_start = max(0, st - 0.25)
-                if right_tokens:
-                    ctx_end = right_tokens[-1].get('end', et) + 0.25
-                else:
-                    ctx_end = et + 0.25
-                
-                # Unique token_id
-                token_id, ext = generate_unique_token_id(code_val, date, st, et, txt, existing_ids)
-                total_extensions += ext
-                
-                # JSON updaten, falls token_id noch nicht da
-                if "token_id" not in w_obj:
-                    new_w_obj = insert_token_id_after_text(w_obj, token_id)
-                    wlist[i] = new_w_obj
-                    json_modified = True
-                
+            tokens.append((
+                token_hash(date, st, et, txt),
                 # transcription.db
-                c_trans.execute('''
-                    INSERT OR REPLACE INTO tokens (
-                        token_id, filename, country_code, radio, date,
-                        speaker_type, sex, mode, discourse,
-                        text, start, end,
-                        context_left, context_right,
-                        context_start, context_end,
-                        lemma
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    token_id, real_fname, code_val, radio, date,
-                    speaker_type, sex, mode, discourse,
-                    txt, st, et,
-                    ctx_left_str, ctx_right_str,
-                    ctx_start, ctx_end,
-                    lem
-                ))
-                
+                (real_fname, code_val, radio, date,
+                speaker_type, sex, mode, discourse,
+                txt, st, et,
+                ctx_left_str, ctx_right_str,
+                ctx_start, ctx_end,
+                lem),
                 # annotation_data.db
-                c_ann.execute('''
-                    INSERT OR REPLACE INTO annotations (
-                        token_id, segment_index, token_index,
-                        lemma, pos, dep, head_text, morph,
-                        neighbors_left, neighbors_right,
-                        foreign_word
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    token_id, seg_i, i,
-                    lem, pos, dep, head, morph_json,
-                    nb_left_str, nb_right_str,
-                    foreign_val   # "1" wenn w_obj["foreign"] vorhanden war, sonst "0"
-                ))
-                
-                inserted += 1
-        
-        # JSON bei Bedarf überschreiben
-        if json_modified:
-            with open(jf, 'w', encoding='utf-8') as file:
-                json.dump(data, file, ensure_ascii=False, indent=2)
+                (seg_i, i,
+                lem, pos, dep, head, morph_json,
+                nb_left_str, nb_right_str,
+                foreign_val)   # "1" wenn w_obj["foreign"] vorhanden war, sonst "0"
+            ))
     
-    conn_trans.commit()
-    conn_ann.commit()
-    conn_trans.close()
-    conn_ann.close()
+    return tokens, missing, empty_tokens_count
+
+def process_file(jf):
+    """
+    Worker: lädt eine Datei und liefert (summary, country_code, tokens, missing,
+    empty_tokens_count) für die Statistik-Datenbanken und transcribe_file().
+    """
+    data = load_json(jf)
+    return (summarize_file(jf, data), data.get("country_code", "UNK")) + prepare_tokens(jf, data)
+
+def add_token_ids(jf, assignments):
+    """
+    Worker: trägt die vergebenen token_ids ((seg_i, i, token_id)) in die
+    Wort-Objekte der JSON-Datei ein und speichert sie.
+    """
+    data = load_json(jf)
+    segments = data.get('segments', [])
+    for seg_i, i, token_id in assignments:
+        segments[seg_i]['words'][i]['token_id'] = token_id
+    save_json(jf, data)
+
+def transcribe_file(state, code_val, tokens, empty_tokens_count):
+    """
+    Vergibt die token_ids für die vorbereiteten Token einer Datei (in Dateireihenfolge,
+    damit Kollisionen wie bisher aufgelöst werden) und schreibt sie in
+    transcription.db und annotation_data.db. Liefert die Liste der token_ids.
+    """
+    existing_ids = state["existing_ids"]
+    token_ids = []
+    trans_rows = []
+    ann_rows = []
+    total_extensions = 0
+    for hash_full, trans_row, ann_row in tokens:
+        token_id, ext = generate_unique_token_id(code_val, hash_full, existing_ids)
+        total_extensions += ext
+        token_ids.append(token_id)
+        trans_rows.append((token_id,) + trans_row)
+        ann_rows.append((token_id,) + ann_row)
+    
+    conn = state["conn"]
+    conn.executemany(INSERT_TOKENS_SQL, trans_rows)
+    conn.executemany(INSERT_ANNOTATIONS_SQL, ann_rows)
+    
+    state["inserted"] += len(tokens)
+    state["empty_tokens"] += empty_tokens_count
+    state["extensions"] += total_extensions
+    return token_ids
+
+def close_transcription(state):
+    """Baut die Indizes auf, schließt beide Datenbanken und gibt die Zusammenfassung aus."""
+    conn = state["conn"]
+    inserted = state["inserted"]
+    empty_tokens_count = state["empty_tokens"]
+    total_extensions = state["extensions"]
+    
+    # Indizes erst nach dem Einfügen in einem Durchgang aufbauen
+    # (token_id ist durch generate_unique_token_id eindeutig)
+    conn.execute("CREATE UNIQUE INDEX main.idx_tokens_token_id ON tokens(token_id)")
+    conn.execute("CREATE UNIQUE INDEX ann.idx_annotations_token_id ON annotations(token_id)")
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")  # ohne Angabe: alle angehängten Datenbanken
+    conn.close()
     total_processed = inserted + empty_tokens_count
     print(f"4/4 --> transcription.db & annotation_data.db: {inserted} Token-Zeilen geschrieben.")
     print(f"    --> IDs verlängert: {total_extensions}")
@@ -544,10 +649,41 @@ def run_transcription():
 # main
 # ----------------------------------------------------------------------
 def main():
-    run_stats_all()
-    run_stats_country()
-    run_stats_files()
-    run_transcription()
+    parser = argparse.ArgumentParser(description="Erstellt die SQLite-Datenbanken aus den JSON-Dateien in grabaciones/.")
+    parser.add_argument(
+        "--no-rewrite", action="store_true",
+        help="JSON-Dateien nicht verändern, auch wenn Wörtern noch die token_id fehlt "
+             "(reine Aktualisierung der Datenbanken)"
+    )
+    args = parser.parse_args()
+
+    # Ein Ladevorgang je JSON-Datei liefert Kennzahlen für 1-3 und die Token
+    # für transcription.db / annotation_data.db (4).
+    # Laden und Aufbereiten laufen parallel in Worker-Prozessen; ex.map liefert
+    # die Ergebnisse in Eingabereihenfolge, IDs und DB-Schreiben bleiben im
+    # Hauptprozess. Dateien mit fehlenden token_ids werden zum Nachtragen in
+    # einem Worker ein zweites Mal gelesen (add_token_ids), weil die IDs erst
+    # im Hauptprozess feststehen.
+    json_files = [e.path for e in os.scandir(GRABACIONES_DIR) if e.name.endswith('.json') and e.is_file()]
+
+    transcription = open_transcription()
+    summaries = []
+    with ProcessPoolExecutor() as ex:
+        rewrites = []
+        results = ex.map(process_file, json_files, chunksize=4)
+        for jf, (summary, code_val, tokens, missing, empty_tokens) in zip(json_files, results):
+            summaries.append(summary)
+            token_ids = transcribe_file(transcription, code_val, tokens, empty_tokens)
+            if missing and not args.no_rewrite:
+                assignments = [(seg_i, i, token_ids[k]) for k, seg_i, i in missing]
+                rewrites.append(ex.submit(add_token_ids, jf, assignments))
+        for f in rewrites:
+            f.result()
+
+    run_stats_all(summaries)
+    run_stats_country(summaries)
+    run_stats_files(summaries)
+    close_transcription(transcription)
 
 if __name__ == "__main__":
     main()